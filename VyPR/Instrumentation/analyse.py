@@ -41,7 +41,7 @@ class Analyser():
         """
         # store specification
         self._specification = specification
-        logger.log.info(f"Specification is\n{self._specification}")
+        logger.log.info("Specification is\n%s", self._specification)
 
         # initialise the map from function names to SCFGs
         self._function_name_to_scfg_map = function_name_to_scfg_map
@@ -93,10 +93,10 @@ class Analyser():
         variable_predicate_pairs = []
         # set the current object to be the top-level specification
         current_obj = self._specification
-        logger.log.info(f"Continuing traversal with current_obj = {current_obj}")
+        logger.log.info("Continuing traversal with current_obj = %s", current_obj)
         # iterate through the structure, using the type Constraint as a place to stop
         while type(current_obj) is not Constraint:
-            logger.log.info(f"Continuing traversal with current_obj = {current_obj}")
+            logger.log.info("Continuing traversal with current_obj = %s", current_obj)
             # traverse depending on the type of the current object
             if type(current_obj) is Specification:
                 current_obj = current_obj.get_quantifier()
@@ -104,7 +104,7 @@ class Analyser():
                 logger.log.info("Encountered Forall instance")
                 # first, add to the map
                 # we check the type of the predicate so we know what kind of variable to instantiate
-                logger.log.info(f"Adding {[current_obj.get_variable(), current_obj.get_predicate()]} to variable_predicate_pairs")
+                logger.log.info("Adding %s to variable_predicate_pairs", [current_obj.get_variable(), current_obj.get_predicate()])
                 variable_predicate_pairs.append([current_obj.get_variable(), current_obj.get_predicate()])
                 # in the case of a quantifier, the two possibilities are
                 # that the next item to consider is a quantifier or a constraint
@@ -115,7 +115,7 @@ class Analyser():
                     # will stop at the next ieration
                     current_obj = current_obj.get_constraint()
         
-        logger.log.info(f"variable_predicate_pairs = {variable_predicate_pairs}")
+        logger.log.info("variable_predicate_pairs = %s", variable_predicate_pairs)
         
         # store the sequence we just constructed
         self._quantifier_pair_sequence = variable_predicate_pairs
@@ -137,7 +137,7 @@ class Analyser():
             # append the new map
             variable_to_symbolic_state_maps.append(new_map)
         
-        logger.log.info(f"variable_to_symbolic_state_maps = {variable_to_symbolic_state_maps}")
+        logger.log.info("variable_to_symbolic_state_maps = %s", variable_to_symbolic_state_maps)
         
         return variable_to_symbolic_state_maps
 
@@ -148,21 +148,21 @@ class Analyser():
         extend current_list using each of these and, for each new list (if not complete), recurse.
         When done, return the set of new maps generated.
         """
-        logger.log.info(f"index_to_process = {index_to_process}")
-        logger.log.info(f"current_list = {current_list}")
+        logger.log.info("index_to_process = %s", index_to_process)
+        logger.log.info("current_list = %s", current_list)
         # get the predicate
         predicate = self._quantifier_pair_sequence[index_to_process][1]
-        logger.log.info(f"Will determine key statements based on predicate {predicate}")
+        logger.log.info("Will determine key statements based on predicate %s", predicate)
         # get the final symbolic state from current_list (can be None if current_list = [])
         if current_list == []:
             previous_symbolic_state = None
         else:
             previous_symbolic_state = current_list[-1]
-        logger.log.info(f"previous_symbolic_state = {previous_symbolic_state}")
+        logger.log.info("previous_symbolic_state = %s", previous_symbolic_state)
         # get the relevant symbolic states based on this predicate
         # this involves determining the relevant scfg and then the symbolic states
         relevant_symbolic_states = self._scfg_searcher.find_symbolic_states(predicate, previous_symbolic_state)
-        logger.log.info(f"relevant_symbolic_states = {relevant_symbolic_states}")
+        logger.log.info("relevant_symbolic_states = %s", relevant_symbolic_states)
         # initialise an empty list of extended lists
         extended_lists = []
         # construct an extension of current_map for each symbolic state that we found
@@ -173,7 +173,7 @@ class Analyser():
             extended_list.append(symbolic_state)
             # add to the list
             extended_lists.append(extended_list)
-        logger.log.info(f"extended_lists = {extended_lists}")
+        logger.log.info("extended_lists = %s", extended_lists)
 
         # recursive base case - index_to_process indicates the final quantifier
         if index_to_process == len(self._quantifier_pair_sequence)-1:
@@ -187,15 +187,15 @@ class Analyser():
             recursed_lists = []
             # iterate through extended lists, recurse on them and add results to recursed_lists
             for extended_list in extended_lists:
-                logger.log.info(f"Recursing on extended_list = {extended_list}")
+                logger.log.info("Recursing on extended_list = %s", extended_list)
                 # recurse
                 new_lists = self._recurse_on_quantifier(index_to_process+1, extended_list)
-                logger.log.info(f"From recursion, new_lists = {new_lists}")
+                logger.log.info("From recursion, new_lists = %s", new_lists)
                 # add to list of recursed lists
                 recursed_lists += new_lists
             lists_to_return = recursed_lists
         
-        logger.log.info(f"Key statements identified by quantifier, lists_to_return = {lists_to_return}")
+        logger.log.info("Key statements identified by quantifier, lists_to_return = %s", lists_to_return)
         
         return lists_to_return
     
@@ -217,18 +217,18 @@ class Analyser():
         instrumentation_point_tree = {}
         # get the constraint part of the specification
         constraint = self._specification.get_constraint()
-        logger.log.info(f"constraint = {constraint}")
+        logger.log.info("constraint = %s", constraint)
         # get the atomic constraints
         atomic_constraints = constraint.get_atomic_constraints()
-        logger.log.info(f"atomic_constraints = {atomic_constraints}")
+        logger.log.info("atomic_constraints = %s", atomic_constraints)
         # iterate through the maps
         for (map_index, variable_to_symbolic_state_map) in enumerate(variable_to_symbolic_state_maps):
-            logger.log.info(f"Processing map_index = {map_index}")
+            logger.log.info("Processing map_index = %s", map_index)
             # initialise map for this map index
             instrumentation_point_tree[map_index] = {}
             # iterate through the atomic constraints
             for (atomic_constraint_index, atomic_constraint) in enumerate(atomic_constraints):
-                logger.log.info(f"Processing atomic_constraint_index = {atomic_constraint_index}")
+                logger.log.info("Processing atomic_constraint_index = %s", atomic_constraint_index)
                 # construct this entry of the map
                 instrumentation_point_tree[map_index][atomic_constraint_index] = \
                     self._scfg_searcher.get_instrumentation_points_for_atomic_constraint(
@@ -236,8 +236,10 @@ class Analyser():
                         variable_to_symbolic_state_map
                     )
                 logger.log.info(
-                    f"map_index = {map_index}, atomic_constraint_index = {atomic_constraint_index} gave "\
-                        f"key statements {instrumentation_point_tree[map_index][atomic_constraint_index]}"
+                    "map_index = %s, atomic_constraint_index = %s gave key statements %s",
+                    map_index,
+                    atomic_constraint_index,
+                    instrumentation_point_tree[map_index][atomic_constraint_index]
                 )
 
         return instrumentation_point_tree
\ No newline at end of file
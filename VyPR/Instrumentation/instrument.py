@@ -42,7 +42,7 @@ class Instrument():
         # import specification from the file given
         self._specification = prepare_specification(specification_file)
 
-        logger.log.info(f"Imported specification is\n{self._specification}")
+        logger.log.info("Imported specification is\n%s", self._specification)
 
         # get a list of all functions used in the specification
         logger.log.info("Calling self._specification.get_function_names_used to get a list of all modules relevant to the specification")
@@ -72,7 +72,7 @@ class Instrument():
         self._function_name_to_scfg_map = {}
         # get SCFG and AST for each function
         for function in self._all_functions:
-            logger.log.info(f"Calling construct_scfg_of_function on function '{function}'")
+            logger.log.info("Calling construct_scfg_of_function on function '%s'", function)
             # get module from function
             module = self._get_module_from_function(function)
             # get scfg for this function based on self._filename_to_ast_list[filename]
@@ -143,10 +143,8 @@ class Instrument():
         """
         Given a module, get its filename, read in the code from it and construct the ASTs.
         """
-        # translate module to have / instead of .
-        module = module.replace(".", "/")
         # get filename
-        filename = os.path.join(self._root_directory, f"{module}.py")
+        filename = self._get_filename_from_module(module)
         # construct file handle
         with open(filename, "r") as h:
             code = h.read()
@@ -158,10 +156,8 @@ class Instrument():
         """
         Given a module, gets its filename and read in the code lines from it.
         """
-        # translate module to have / instead of .
-        module = module.replace(".", "/")
         # get filename
-        filename = os.path.join(self._root_directory, f"{module}.py")
+        filename = self._get_filename_from_module(module)
         # construct file handle
         with open(filename, "r") as h:
             # get trippes lines
@@ -177,13 +173,13 @@ class Instrument():
         logger.log.info("Inserting instruments into source code")
         # get atomic constraints of the specification so we can decide on what each instrument should look like
         atomic_constraints = self._specification.get_constraint().get_atomic_constraints()
-        logger.log.info(f"atomic_constraints = {atomic_constraints}")
+        logger.log.info("atomic_constraints = %s", atomic_constraints)
         # initialise empty list of triples (module_name, line_index, instrument_code)
         list_of_instrument_triples = []
         # traverse self._instrumentation_tree in order to insert instrumentation points for quantifiers
         logger.log.info("Inserting instruments for constraints")
         for (map_index, current_map) in enumerate(self._quantifier_instrumentation_points):
-            logger.log.info(f"map_index = {map_index}")
+            logger.log.info("map_index = %s", map_index)
             # iterate through the variables of the map
             for variable in current_map:
                 # get the symbolic state
@@ -211,21 +207,21 @@ class Instrument():
         # traverse self._instrumentation_tree in order to insert instrumentation points for constraints
         logger.log.info("Inserting instruments for constraints")
         for map_index in self._instrumentation_tree:
-            logger.log.info(f"map_index = {map_index}")
+            logger.log.info("map_index = %s", map_index)
             for atom_index in self._instrumentation_tree[map_index]:
-                logger.log.info(f"atom_index = {atom_index}")
+                logger.log.info("atom_index = %s", atom_index)
                 # get the atom at atom_index
                 relevant_atom = atomic_constraints[atom_index]
-                logger.log.info(f"relevant_atom = {relevant_atom}")
+                logger.log.info("relevant_atom = %s", relevant_atom)
                 # iterate through the subatom indices
                 for subatom_index in self._instrumentation_tree[map_index][atom_index]:
-                    logger.log.info(f"subatom_index = {subatom_index}")
+                    logger.log.info("subatom_index = %s", subatom_index)
                     # get the subatom at subatom_index
                     relevant_subatom = relevant_atom.get_expression(subatom_index)
-                    logger.log.info(f"relevant_subatom = {relevant_subatom}")
+                    logger.log.info("relevant_subatom = %s", relevant_subatom)
                     # iterate through the symbolic states
                     for symbolic_state in self._instrumentation_tree[map_index][atom_index][subatom_index]:
-                        logger.log.info(f"Processing symbolic_state = {symbolic_state}")
+                        logger.log.info("Processing symbolic_state = %s", symbolic_state)
                         # get the index in the block of asts where the instrument's code will be inserted
                         index_in_block = symbolic_state.get_ast_object().parent_block.index(symbolic_state.get_ast_object())
                         # get the line number at which to insert the code
@@ -236,8 +232,7 @@ class Instrument():
                         function = self._analyser.get_scfg_searcher().get_function_name_of_symbolic_state(symbolic_state)
                         # derive the module name from the function
                         module = self._get_module_from_function(function)
-                        logger.log.info(f"Generating list of instrument triples with "\
-                            f"index_in_block={index_in_block}, line_number={line_number}, line_index={line_index}, function={function}, module={module}")
+                        logger.log.info("Generating list of instrument triples with index_in_block=%s, line_number=%s, line_index=%s, function=%s, module=%s", index_in_block, line_number, line_index, function, module)
                         # generate and append the instrument code
                         list_of_instrument_triples += self._generate_constraint_instrument_code(
                             module,
@@ -288,7 +283,7 @@ class Instrument():
         """
         Given all necessary information, generate the instrumentation code for a quantifier.
         """
-        logger.log.info(f"Getting lines of module_name = {module_name}")
+        logger.log.info("Getting lines of module_name = %s", module_name)
         # get the module lines
         module_lines = self._module_to_lines[module_name]
         # get the indentation level of the code to be inserted
@@ -301,7 +296,7 @@ class Instrument():
         base = "g.vypr" if self._assume_flask else "vypr"
         instrument_function = f"{base}.send_trigger"
         # check the instrument type
-        logger.log.info(f"Generating instrument code for quantifier with variable = {variable}, based on map_index = {map_index}")
+        logger.log.info("Generating instrument code for quantifier with variable = %s, based on map_index = %s", variable, map_index)
         code = f"""{indentation}{instrument_function}({map_index}, '{variable}')"""
         return code
     
@@ -309,7 +304,7 @@ class Instrument():
         """
         Given all of the necessary information, generate the instrumentation code for a constraint.
         """
-        logger.log.info(f"Getting lines of module_name = {module_name}")
+        logger.log.info("Getting lines of module_name = %s", module_name)
         # get the module lines
         module_lines = self._module_to_lines[module_name]
         # get the indentation level of the code to be inserted
@@ -322,7 +317,7 @@ class Instrument():
         base = "g.vypr" if self._assume_flask else "vypr"
         instrument_function = f"{base}.send_measurement"
         # check the instrument type
-        logger.log.info(f"Generating measurement instrument code according to subatom = {subatom} with type {type(subatom)}")
+        logger.log.info("Generating measurement instrument code according to subatom = %s with type %s", subatom, type(subatom))
         if type(subatom) is ValueInConcreteState:
             # construct the instrument code
             code = f"""{indentation}{instrument_function}({map_index}, {atom_index}, {subatom_index}, {subatom.get_program_variable()})"""
@@ -359,25 +354,29 @@ class Instrument():
         
         return code
     
+    def _get_filename_from_module(self, module: str, suffix: str = "") -> str:
+        """
+        Given a module name, derive its filename relative to the root directory,
+        adding suffix to the final component before the .py extension.
+
+        The path is constructed in a single os.path.join call so that the
+        separator is correct on every platform.
+        """
+        # split the module name into its packages and the module itself
+        tokens = module.split(".")
+        return os.path.join(self._root_directory, *tokens[:-1], f"{tokens[-1]}{suffix}.py")
+    
     def _get_original_filename_from_module(self, module: str) -> str:
         """
         Given a module name, derive its filename.
         """
-        # begin to convert to filename
-        with_slashes = module.replace(".", "/").replace(".py", "")
-        # join with root directory
-        filename = os.path.join(self._root_directory, f"{with_slashes}.py")
-        return filename
+        return self._get_filename_from_module(module)
     
     def _get_backup_filename_from_module(self, module: str) -> str:
         """
         Given a module name, derive its filename.
         """
-        # begin to convert to filename
-        with_slashes = module.replace(".", "/").replace(".py", "")
-        # join with root directory
-        filename = os.path.join(self._root_directory, f"{with_slashes}_vypr_original.py")
-        return filename
+        return self._get_filename_from_module(module, suffix="_vypr_original")
     
     def compile(self):
         """
@@ -386,7 +385,7 @@ class Instrument():
         logger.log.info("Writing instrumented code")
         # iterate through modules
         for module in self._all_modules:
-            logger.log.info(f"Processing module = {module}")
+            logger.log.info("Processing module = %s", module)
 
             # get lines for this module
             lines = self._module_to_lines[module]
@@ -397,7 +396,7 @@ class Instrument():
             original_filename = self._get_original_filename_from_module(module)
             backup_filename = self._get_backup_filename_from_module(module)
 
-            logger.log.info(f"Instrumenting original_filename = {original_filename}, while keeping a backup in backup_filename = {backup_filename}")
+            logger.log.info("Instrumenting original_filename = %s, while keeping a backup in backup_filename = %s", original_filename, backup_filename)
 
             # if it exists, rename the backup to the original
             if os.path.isfile(backup_filename):
@@ -10,41 +10,65 @@ import os
 import datetime
 import inspect
 
+# severities of the log levels - a message is only written if the severity of its level
+# is at least the severity of the level given to the log
+DEBUG = 0
+INFO = 1
+ERROR = 2
+
+# map from the name of each level to its severity
+LEVELS = {"debug": DEBUG, "info": INFO, "error": ERROR}
+
 class Log():
     """
     Class to handle logging across the VyPR codebase.
     """
 
-    def __init__(self, directory):
+    def __init__(self, directory, level="debug"):
         log_filename = str(datetime.datetime.now())
         # check for existence of the directory
         if not os.path.exists(directory):
             os.makedirs(directory)  # make a directory with intermediate directories
         # open the directory
         self._handle = open(os.path.join(directory, log_filename), "a")
+        # store the lowest severity that is written
+        self._threshold = LEVELS[level]
     
     def close(self):
         self._handle.close()
     
-    def get_formatted_message(self, message):
-        return f"[{datetime.datetime.now()}] [{inspect.stack()[2].function}] [%s] {message}\n"
+    def get_formatted_message(self, message, args, level):
+        # arguments are only interpolated into the message here, so messages
+        # below the threshold of the log are never formatted
+        if args:
+            message = message % args
+        return f"[{datetime.datetime.now()}] [{inspect.stack()[2].function}] [{level}] {message}\n"
     
-    def info(self, message):
-        self._handle.write(self.get_formatted_message(message) % "info")
+    def info(self, message, *args):
+        # check the level first, so neither the message nor the stack inspection is computed if it is not written
+        if self._threshold > INFO:
+            return
+        self._handle.write(self.get_formatted_message(message, args, "info"))
     
-    def debug(self, message):
-        self._handle.write(self.get_formatted_message(message) % "debug")
+    def debug(self, message, *args):
+        if self._threshold > DEBUG:
+            return
+        self._handle.write(self.get_formatted_message(message, args, "debug"))
     
-    def error(self, message):
-        self._handle.write(self.get_formatted_message(message) % "error")
+    def error(self, message, *args):
+        # error is the most severe level, so error messages are always written
+        self._handle.write(self.get_formatted_message(message, args, "error"))
 
 # set up global configuration variables
 log = None
 
-def initialise_logging(directory="logs/"):
+def initialise_logging(directory="logs/", level="debug"):
+    """
+    Set up the global log, writing only messages whose level is at least as severe as level.
+    """
     global log
     if not log:
-        log = Log(directory)
+        log = Log(directory, level)
 
 def end_logging():
     global log
@@ -8,7 +8,7 @@ Module that holds all logic regarding binding/formula tree pairs derived while m
 import logging
 import datetime
 
-from VyPR.Specifications.constraints import is_normal_atom, is_mixed_atom, get_base_variable, Conjunction, Disjunction, Negation
+from VyPR.Specifications.constraints import is_atom, Conjunction, Disjunction, Negation
 
 def milliseconds(dt):
     # thanks to https://stackoverflow.com/questions/6999726/how-can-i-convert-a-datetime-object-to-milliseconds-since-epoch-unix-time-in-p - 2021-04-12
@@ -24,6 +24,8 @@ class FormulaTree():
     It is associated with a sequence of timestamps
     corresponding to when the concrete state/transition for each variable was observed at runtime.
     """
+    __slots__ = ('_timestamps', '_constraint', '_formula_tree', '_atoms', '_atom_indices',
+                 '_variables', '_measurement_dictionary')
 
     def __init__(self, timestamps: list, constraint, variables: list, measurement_dictionary = None):
         """
@@ -37,17 +39,19 @@ class FormulaTree():
             {atom index : {subatom index : measurement}}
         """
         logging.info("Instantiating new formula tree")
-        logging.info(str(measurement_dictionary))
+        logging.info("%s", measurement_dictionary)
         self._timestamps = timestamps
-        self._formula_tree = constraint.instantiate()
+        self._constraint = constraint
+        self._formula_tree = constraint.copy_instantiated()
         self._atoms = constraint.get_atomic_constraints()
+        self._atom_indices = constraint.get_atom_indices()
         self._variables = variables
         self._measurement_dictionary = measurement_dictionary
-        logging.info("  self._timestamps = %s" % str(self._timestamps))
-        logging.info("  self._formula_tree = %s" % str(self._formula_tree))
-        logging.info("  self._atoms = %s" % str(self._atoms))
-        logging.info("  self._variables = %s" % str(self._variables))
-        logging.info("  self._measurement_dictionary = %s" % str(self._measurement_dictionary))
+        logging.info("  self._timestamps = %s", self._timestamps)
+        logging.info("  self._formula_tree = %s", self._formula_tree)
+        logging.info("  self._atoms = %s", self._atoms)
+        logging.info("  self._variables = %s", self._variables)
+        logging.info("  self._measurement_dictionary = %s", self._measurement_dictionary)
 
         # run the formula tree update with respect to the measurement dictionary, if given
         if self._measurement_dictionary:
@@ -82,15 +86,11 @@ class FormulaTree():
         # iterate through the dictionary
         for atom_index in self._measurement_dictionary:
             for subatom_index in self._measurement_dictionary[atom_index]:
-                # get the atom with atom_index
-                relevant_atom = self._atoms[atom_index]
-                # get the relevant expression based subatom_index
-                expression = relevant_atom.get_expression(subatom_index)
-                # get base variable of expression
-                base_variable = get_base_variable(expression)
-                base_variable_name = base_variable.get_name()
+                # get the index of the base variable of the relevant expression,
+                # which the constraint computes once for each atom index/subatom index pair
+                base_variable_index = self._constraint.get_base_variable_index(atom_index, subatom_index)
                 # check whether the base variable has index variable_index
-                if self._variables.index(base_variable_name) < variable_index:
+                if base_variable_index < variable_index:
                     if atom_index in final_dictionary:
                         if subatom_index not in final_dictionary[atom_index]:
                             final_dictionary[atom_index][subatom_index] = self._measurement_dictionary[atom_index][subatom_index]
@@ -105,7 +105,7 @@ class FormulaTree():
         """
         Given a measurement, atom and subatom indices, update the formula tree
         """
-        logging.info("Updating formula tree with measurement = %s with atom_index = %i, subatom_index = %i" % (measurement, atom_index, subatom_index))
+        logging.info("Updating formula tree with measurement = %s with atom_index = %i, subatom_index = %i", measurement, atom_index, subatom_index)
         # if measurement is a timestamp, convert to milliseconds
         if type(measurement) is datetime.datetime:
             measurement = milliseconds(measurement)/1000.0
@@ -120,7 +120,7 @@ class FormulaTree():
         # assign the result in case there is a truth value
         logging.info("Recursing on tree to update")
         self._formula_tree = self._recurse_on_tree(self._formula_tree, measurement, atom_index, subatom_index)
-        logging.info("Update finished - result self._formula_tree = %s" % self._formula_tree)
+        logging.info("Update finished - result self._formula_tree = %s", self._formula_tree)
         return self._formula_tree
     
     def _recurse_on_tree(self, current_obj, measurement, atom_index: int, subatom_index: int):
@@ -134,16 +134,16 @@ class FormulaTree():
         we recurse and then check to see whether a truth value can be declared
         for that part of the formula tree.
         """
-        logging.info("Processing current_obj = %s in formula tree traversal" % str(current_obj))
-        if is_normal_atom(current_obj) or is_mixed_atom(current_obj):
+        logging.info("Processing current_obj = %s in formula tree traversal", current_obj)
+        if is_atom(current_obj):
             logging.info("Recursive base case - found an atom")
             # base case
             # check to see whether current_obj matches atom_index
-            logging.info("Checking to see if %s matches index %i" % (str(current_obj), atom_index))
-            if self._atoms.index(current_obj) == atom_index:
+            logging.info("Checking to see if %s matches index %i", current_obj, atom_index)
+            if self._atom_indices[current_obj] == atom_index:
                 # return the answer given by the atom under the measurement given
                 # the answer can be true, false or inconclusive (for mixed atoms)
-                logging.info("current_obj = %s matches - updating with measurement = %s" % (str(current_obj), str(measurement)))
+                logging.info("current_obj = %s matches - updating with measurement = %s", current_obj, measurement)
                 return current_obj.check(atom_index, subatom_index, self._measurement_dictionary)
             else:
                 # this isn't the atom we need, so just return it
@@ -158,19 +158,32 @@ class FormulaTree():
             # if any gives true
             if type(current_obj) is Disjunction:
                 # iterate through the operands, checking whether any are evaluated to True
+                # (or whether all are False)
                 disjuncts = current_obj.get_disjuncts()
-                logging.info("Found disjunction - recursing on disjuncts %s" % disjuncts)
+                logging.info("Found disjunction - recursing on disjuncts %s", disjuncts)
+                # count number of False occurrences so we can check for all disjuncts being false
+                number_of_falses = 0
                 for (index, disjunct) in enumerate(disjuncts):
-                    logging.info("Processing disjunct = %s" % str(disjunct))
-                    # replace the disjunct with a new value (this may just be the old value if
-                    # nothing could be changed given the measurement)
-                    disjuncts[index] = self._recurse_on_tree(disjunct, measurement, atom_index, subatom_index)
-                    logging.info("New value for disjunct is %s" % disjunct)
-                    # explicitly check for True
-                    if disjuncts[index] == True:
-                        logging.info("Since new value is True, and we have a disjunction, replacing disjunction with True")
-                        # return True to replace current_obj with True in its parent formula
-                        return True
+                    # a disjunct that has already been evaluated to False cannot change,
+                    # so there is no need to traverse it again
+                    if disjunct is not False:
+                        logging.info("Processing disjunct = %s", disjunct)
+                        # replace the disjunct with a new value (this may just be the old value if
+                        # nothing could be changed given the measurement)
+                        disjuncts[index] = self._recurse_on_tree(disjunct, measurement, atom_index, subatom_index)
+                        logging.info("New value for disjunct is %s", disjuncts[index])
+                        # explicitly check for True
+                        if disjuncts[index] == True:
+                            logging.info("Since new value is True, and we have a disjunction, replacing disjunction with True")
+                            # return True to replace current_obj with True in its parent formula
+                            return True
+                    if disjuncts[index] == False:
+                        # increase the number of Falses
+                        number_of_falses += 1
+                # check for all disjuncts being False
+                if number_of_falses == len(disjuncts):
+                    logging.info("Number of falses (%i) = number of disjuncts (%i), so replacing disjunction with False", number_of_falses, len(disjuncts))
+                    return False
 
             # in the conjunction case, we recurse on each conjunct and see
             # if any gives false
@@ -178,16 +191,19 @@ class FormulaTree():
                 # iterate through the operands, checking whether any are evaluated to False
                 # (or whether all are True)
                 conjuncts = current_obj.get_conjuncts()
-                logging.info("Found conjunction - recursing on conjuncts %s" % conjuncts)
+                logging.info("Found conjunction - recursing on conjuncts %s", conjuncts)
                 # count number of True occurrences so we can check for all conjuncts being true
                 logging.info("Setting count of all true conjuncts to 0")
                 number_of_trues = 0
                 for (index, _) in enumerate(conjuncts):
-                    logging.info("Processing conjunct = %s" % str(conjuncts[index]))
-                    # replace the conjunct with a new value (this may just be the old value if
-                    # nothing could be changed given the measurement)
-                    conjuncts[index] = self._recurse_on_tree(conjuncts[index], measurement, atom_index, subatom_index)
-                    logging.info("New value for conjunct is %s" % str(conjuncts[index]))
+                    # a conjunct that has already been evaluated to True cannot change,
+                    # so there is no need to traverse it again
+                    if conjuncts[index] is not True:
+                        logging.info("Processing conjunct = %s", conjuncts[index])
+                        # replace the conjunct with a new value (this may just be the old value if
+                        # nothing could be changed given the measurement)
+                        conjuncts[index] = self._recurse_on_tree(conjuncts[index], measurement, atom_index, subatom_index)
+                        logging.info("New value for conjunct is %s", conjuncts[index])
                     # explicitly check for False
                     if conjuncts[index] == False:
                         logging.info("conjuncts[index] = False in conjunction, so replacing conjunction with False")
@@ -197,10 +213,10 @@ class FormulaTree():
                         logging.info("conjuncts[index] = True in conjunction, so incrementing the number of trues found")
                         # increase the number of Trues
                         number_of_trues += 1
-                        logging.info("Number of trues/number of conjuncts = %i/%i" % (number_of_trues, len(conjuncts)))
+                        logging.info("Number of trues/number of conjuncts = %i/%i", number_of_trues, len(conjuncts))
                 # check for all conjuncts being True
                 if number_of_trues == len(conjuncts):
-                    logging.info("Number of trues (%i) = number of conjuncts (%i), so replacing conjunction with True" % (number_of_trues, len(conjuncts)))
+                    logging.info("Number of trues (%i) = number of conjuncts (%i), so replacing conjunction with True", number_of_trues, len(conjuncts))
                     return True
 
             # in the negation case, we see if the operand gives a truth value
@@ -208,7 +224,7 @@ class FormulaTree():
                 logging.info("Found negation - recursing on operand")
                 # recurse on the negation operand, returning True or False if the operand gives a truth value
                 current_obj.operand = self._recurse_on_tree(current_obj.operand, measurement, atom_index, subatom_index)
-                logging.info("New value of negation operand is %s" % str(current_obj.operand))
+                logging.info("New value of negation operand is %s", current_obj.operand)
                 # check truth value
                 if current_obj.operand == True:
                     logging.info("current_obj.operand = True, so negation becomes False")
@@ -219,5 +235,5 @@ class FormulaTree():
                     # negation can be evaluted to True
                     return True
 
-            logging.info("Returning current_obj = %s to previous level of formula tree" % str(current_obj))
+            logging.info("Returning current_obj = %s to previous level of formula tree", current_obj)
             return current_obj
\ No newline at end of file
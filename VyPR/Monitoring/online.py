@@ -28,7 +28,7 @@ def monitoring_process_function(online_monitor_object, specification_file):
     logging.info("Starting VyPR monitoring process.")
     # read in the specification
     specification = prepare_specification(specification_file)
-    logging.info("Reading in specification from file %s" % specification_file)
+    logging.info("Reading in specification from file %s", specification_file)
     # initialise the stop signal to False
     stop_signal_received = False
     # initialise map from map indices to lists of formula trees
@@ -37,7 +37,7 @@ def monitoring_process_function(online_monitor_object, specification_file):
     # get the list of variables from the specification
     logging.info("Getting list of variables from specification")
     variables = specification.get_variables()
-    logging.info("Sequence of variables in specification is %s" % str(variables))
+    logging.info("Sequence of variables in specification is %s", variables)
     # loop until the end signal is received
     logging.info("Beginning monitoring loop - loop while stop_signal_received is False")
     while not stop_signal_received:
@@ -48,7 +48,7 @@ def monitoring_process_function(online_monitor_object, specification_file):
             # set stop signal
             logging.info("Received stop signal instrument")
             stop_signal_received = True
-            logging.info("stop_signal_received = %s" % stop_signal_received)
+            logging.info("stop_signal_received = %s", stop_signal_received)
         elif new_measurement["type"] == "get_intermediate_verdicts":
             # push the verdicts so far to the queue
             logging.info("Constructing dictionary final_map_index_to_formulas_map to contain formula trees for (complete or partial) bindings")
@@ -62,8 +62,8 @@ def monitoring_process_function(online_monitor_object, specification_file):
             online_monitor_object.verdict_queue.put(final_map_index_to_formulas_map)
         elif new_measurement["type"] == "trigger":
             logging.info("Received trigger instrument")
-            logging.info("  map_index = %s" % new_measurement["map_index"])
-            logging.info("  variable = %s" % new_measurement["variable"])
+            logging.info("  map_index = %s", new_measurement["map_index"])
+            logging.info("  variable = %s", new_measurement["variable"])
             # get timestamp for this trigger
             logging.info("Getting timestamp to be used in new formula tree")
             trigger_timestamp = datetime.datetime.now()
@@ -72,10 +72,10 @@ def monitoring_process_function(online_monitor_object, specification_file):
             variable_index = variables.index(new_measurement["variable"])
             # get the map index
             map_index = new_measurement["map_index"]
-            logging.info("variable_index = %i" % variable_index)
+            logging.info("variable_index = %i", variable_index)
             # check for an existing list of formula trees with this index
             if not map_index_to_formula_trees.get(map_index):
-                logging.info("Initialising empty set of formula trees in map_index_to_formula_trees for map_index = %i" % map_index)
+                logging.info("Initialising empty set of formula trees in map_index_to_formula_trees for map_index = %i", map_index)
                 map_index_to_formula_trees[map_index] = []
             # if variable_index == 0, we generate a new binding/formula tree pair
             # and add map_index_to_formula_trees under the key map_index
@@ -85,17 +85,17 @@ def monitoring_process_function(online_monitor_object, specification_file):
             # get the constraint held by the specification
             logging.info("Getting constraint part of specification ready for formula tree instantiation")
             constraint = specification.get_constraint()
-            logging.info("Got constraint = %s from specification" % str(constraint))
+            logging.info("Got constraint = %s from specification", constraint)
 
             # check the variable index
             if variable_index == 0:
-                logging.info("Instantiating new formula tree with timestamp %s" % str(trigger_timestamp))
+                logging.info("Instantiating new formula tree with timestamp %s", trigger_timestamp)
                 # construct a sequence consisting of a single timestamp
                 logging.info("Constructing list containing a single timestamp")
                 current_timestamp_sequence = [trigger_timestamp]
                 # generate new binding/formula tree pair
                 new_formula_tree = FormulaTree(current_timestamp_sequence, constraint, variables)
-                logging.info("New formula tree %s instantiated" % str(new_formula_tree))
+                logging.info("New formula tree %s instantiated", new_formula_tree)
                 # add to the appropriate list of formula trees
                 logging.info("Adding formula tree to map_index_to_formula_trees")
                 map_index_to_formula_trees[map_index].append(new_formula_tree)
@@ -106,22 +106,22 @@ def monitoring_process_function(online_monitor_object, specification_file):
                 # iterate through the formula trees
                 for formula_tree in formula_trees:
                     # decide whether we need to extend the binding attached to the formula tree
-                    logging.info("Inspecting formula tree %s" % formula_tree)
+                    logging.info("Inspecting formula tree %s", formula_tree)
                     # get the timestamp sequence from the formula tree
                     timestamps = formula_tree.get_timestamps()
                     # check whether the length of the timestamp sequence is equal to variable_index
                     if len(timestamps) == variable_index:
-                        logging.info("Using state in formula tree %s to instantiate a new one" % formula_tree)
+                        logging.info("Using state in formula tree %s to instantiate a new one", formula_tree)
                         # generate an extended timestamp sequence
                         extended_timestamp_sequence = [t for t in timestamps] + [trigger_timestamp]
-                        logging.info("extended_timestamp_sequence = %s" % extended_timestamp_sequence)
+                        logging.info("extended_timestamp_sequence = %s", extended_timestamp_sequence)
                         # get the assignment of atoms/expressions to measurements from formula_tree
                         measurements = formula_tree.get_measurements_for_variable_index(variable_index)
-                        logging.info("measurements = %s" % measurements)
+                        logging.info("measurements = %s", measurements)
                         # instantiate new formula tree with the extended timestamp sequence, and the measurements
                         # associated with variables from the old formula tree
                         extended_formula_tree = FormulaTree(extended_timestamp_sequence, constraint, variables, measurements)
-                        logging.info("extended_formula_tree = %s" % str(extended_formula_tree))
+                        logging.info("extended_formula_tree = %s", extended_formula_tree)
                         # store the new formula tree
                         map_index_to_formula_trees[map_index].append(extended_formula_tree)
                         logging.info("New formula tree added to map_index_to_formula_trees")
@@ -133,10 +133,10 @@ def monitoring_process_function(online_monitor_object, specification_file):
             map_index = new_measurement["map_index"]
             atom_index = new_measurement["atom_index"]
             subatom_index = new_measurement["subatom_index"]
-            logging.info("  measurement = %s" % measurement)
-            logging.info("  map_index =  %s" % map_index)
-            logging.info("  atom_index = %s" % atom_index)
-            logging.info("  subatom_index = %s" % subatom_index)
+            logging.info("  measurement = %s", measurement)
+            logging.info("  map_index =  %s", map_index)
+            logging.info("  atom_index = %s", atom_index)
+            logging.info("  subatom_index = %s", subatom_index)
             # get the list of formula trees in map_index_to_formula_trees under the key map_index
             # and attempt to update each one with the measurement
             # Note: a formula tree can only be updated with respect to a measurement once - if the update is attempted
@@ -148,7 +148,7 @@ def monitoring_process_function(online_monitor_object, specification_file):
             # attempt to update each formula tree with the measurement received
             for (index, formula_tree) in enumerate(formula_trees):
                 # update the formula tree
-                logging.info(f"Updating formula tree {formula_tree} with measurement = {measurement}")
+                logging.info("Updating formula tree %s with measurement = %s", formula_tree, measurement)
                 updated_formula_tree = formula_tree.update_with_measurement(measurement, atom_index, subatom_index)
     
     # register verdicts generated by complete or partial bindings
@@ -231,7 +231,7 @@ class OnlineMonitor():
                     # set up the monitoring process/thread
                     self.monitoring_process = Thread(target=monitoring_process_function, args=(self, specification_file))
                     # start the process/thread
-                    logging.info(f"Starting monitoring thread for request at time {g.start_time.isoformat()}")
+                    logging.info("Starting monitoring thread for request at time %s", g.start_time.isoformat())
                     self.monitoring_process.start()
                     # attach self to g
                     g.vypr = self
@@ -239,7 +239,7 @@ class OnlineMonitor():
                 @flask_obj.after_request
                 def stop_monitor(response):
                     # end the monitoring process
-                    logging.info(f"Stopping monitoring thread that began at time {g.start_time}")
+                    logging.info("Stopping monitoring thread that began at time %s", g.start_time)
                     # send signal to end monitoring, join the thread and get verdicts
                     self.end_monitoring()
                     # get verdicts
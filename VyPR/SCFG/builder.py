@@ -9,6 +9,7 @@ Module containing logic for construction of a symbolic control-flow graph given
 import ast
 import datetime
 import graphviz
+from array import array
 
 import VyPR.Logging.logger as logger
 
@@ -27,6 +28,12 @@ from VyPR.SCFG.symbolic_states import (SymbolicState,
                                         TryEntrySymbolicState,
                                         TryExitSymbolicState)
 
+# map from the types of ast that give a single statement symbolic state to the function that processes them
+_STATEMENT_PROCESSORS = {
+    ast.Assign: process_assignment_ast,
+    ast.Expr: process_expression_ast
+}
+
 class SCFG():
 
     def __init__(self, program_asts: list):
@@ -41,6 +48,12 @@ class SCFG():
         self._symbolic_states: list = [self._root]
         # begin processing
         self.subprogram_to_scfg(self._program_asts, self._root)
+        # construction is finished, so freeze the edges of each symbolic state
+        for symbolic_state in self._symbolic_states:
+            symbolic_state.freeze()
+        # the flat adjacency arrays are built on first use
+        self._csr = None
+        self._state_index = None
     
     def get_root_symbolic_state(self):
         return self._root
@@ -67,10 +80,12 @@ class SCFG():
         """
         # get all symbolic states from symbol and then filter on reachability
         relevant_symbolic_states = self.get_symbolic_states_from_symbol(symbol)
+        # determine the symbolic states reachable from symbolic_state once, rather than once per target
+        reachable_ids = set(map(id, self._get_reachable_symbolic_states(symbolic_state)))
         # filter based on reachability
         relevant_symbolic_states = list(
             filter(
-                lambda target_symbolic_state : self.is_reachable_from(target_symbolic_state, symbolic_state),
+                lambda target_symbolic_state : id(target_symbolic_state) in reachable_ids,
                 relevant_symbolic_states
             )
         )
@@ -87,37 +102,71 @@ class SCFG():
         return target_symbolic_state in all_reachable_symbolic_states
 
     
+    def to_csr(self) -> tuple:
+        """
+        Export the edges of this SCFG as flat integer arrays in compressed sparse row form.
+
+        Symbolic states are numbered by their position in self._symbolic_states.  The result
+        is a tuple (succ_offsets, succ_nodes, pred_offsets, pred_nodes) such that the children
+        of the symbolic state with index i are succ_nodes[succ_offsets[i]:succ_offsets[i+1]],
+        and similarly for parents.
+
+        Since the SCFG is frozen after construction, the arrays are computed once and cached.
+        """
+        if self._csr is None:
+            # number the symbolic states
+            self._state_index = {id(symbolic_state): index for (index, symbolic_state) in enumerate(self._symbolic_states)}
+            state_index = self._state_index
+            # initialise the arrays
+            succ_offsets, succ_nodes = array('i', [0]), array('i')
+            pred_offsets, pred_nodes = array('i', [0]), array('i')
+            # fill in the children and parents of each symbolic state
+            for symbolic_state in self._symbolic_states:
+                succ_nodes.extend([state_index[id(child)] for child in symbolic_state.get_children()])
+                succ_offsets.append(len(succ_nodes))
+                pred_nodes.extend([state_index[id(parent)] for parent in symbolic_state.get_parents()])
+                pred_offsets.append(len(pred_nodes))
+            self._csr = (succ_offsets, succ_nodes, pred_offsets, pred_nodes)
+        return self._csr
+    
     def _get_reachable_symbolic_states(self, source_symbolic_state) -> list:
         """
         Determine all symbolic states reachable from the source.
+
+        The traversal works over the integer adjacency arrays given by to_csr.
         """
+        succ_offsets, succ_nodes, _, _ = self.to_csr()
+        # a symbolic state that is not in this SCFG cannot reach any of its symbolic states
+        source_index = self._state_index.get(id(source_symbolic_state))
+        if source_index is None:
+            return []
         # initialise a stack
-        stack = [source_symbolic_state]
-        # initialise the list of visited symbolic states
-        visited = [source_symbolic_state]
-        # initialise the list of symbolic states reachable from source
+        stack = [source_index]
+        # initialise the visited mask
+        visited = bytearray(len(self._symbolic_states))
+        visited[source_index] = 1
+        # initialise the list of indices of symbolic states reachable from source
         reachable = []
         # iterate while the stack is non-empty
-        while len(stack) > 0:
+        while stack:
             # get the top of the stack
             top = stack.pop()
-            # get all children
-            children = top.get_children()
-            # add all unvisited children to the stack
-            unvisited_children = list(
-                filter(
-                    lambda child: child not in visited,
-                    children
-                )
-            )
+            # get all unvisited children
+            unvisited_children = [
+                child for child in succ_nodes[succ_offsets[top]:succ_offsets[top + 1]]
+                if not visited[child]
+            ]
             # add to stack
             stack += unvisited_children
             # add to reachable
             reachable += unvisited_children
             # add to visited
-            visited += unvisited_children
+            for child in unvisited_children:
+                visited[child] = 1
         
-        return reachable
+        # map the indices back to symbolic states
+        symbolic_states = self._symbolic_states
+        return [symbolic_states[index] for index in reachable]
     
     def get_next_symbolic_states(self, program_variable, base_symbolic_state) -> list:
         """
@@ -168,61 +217,58 @@ class SCFG():
         # iterate through the current subprogram
         for subprogram_ast in subprogram:
 
-            logger.log.info(f"Processing AST {subprogram_ast}")
+            logger.log.info("Processing AST %s", subprogram_ast)
 
             # check for the type of the current ast
-            if type(subprogram_ast) in [ast.Assign, ast.Expr]:
-                logger.log.info(f"AST {subprogram_ast} is {type(subprogram_ast)} instance")
-                # define dictionary from ast types to the processing method to use
-                ast_type_to_function = {
-                    ast.Assign: process_assignment_ast,
-                    ast.Expr: process_expression_ast
-                }
+            # assignments and expressions are looked up in a single step, which also gives the processing method to use
+            process_statement_ast = _STATEMENT_PROCESSORS.get(type(subprogram_ast))
+            if process_statement_ast is not None:
+                logger.log.info("AST %s is %s instance", subprogram_ast, type(subprogram_ast))
                 # instantiate the symbolic state
-                new_symbolic_state: SymbolicState = ast_type_to_function[type(subprogram_ast)](subprogram_ast, subprogram)
+                new_symbolic_state: SymbolicState = process_statement_ast(subprogram_ast, subprogram)
                 # add it to the list of vertices
                 self._symbolic_states.append(new_symbolic_state)
-                logger.log.info(f"Instantiated new_symbolic_state = {new_symbolic_state} and added to self._symbolic_states with self = {self}")
+                logger.log.info("Instantiated new_symbolic_state = %s and added to self._symbolic_states with self = %s", new_symbolic_state, self)
                 # set it as the child of the previous
-                logger.log.info(f"Calling previous_symbolic_state.add_child with previous_symbolic_state = {previous_symbolic_state} and new_symbolic_state = {new_symbolic_state}")
+                logger.log.info("Calling previous_symbolic_state.add_child with previous_symbolic_state = %s and new_symbolic_state = %s", previous_symbolic_state, new_symbolic_state)
                 previous_symbolic_state.add_child(new_symbolic_state)
-                logger.log.info(f"Setting previous_symbolic_state = {new_symbolic_state}")
+                logger.log.info("Setting previous_symbolic_state = %s", new_symbolic_state)
                 previous_symbolic_state = new_symbolic_state
 
             
             elif type(subprogram_ast) is ast.If:
-                logger.log.info(f"Type of sub_program_ast = {subprogram_ast} is ast.If")
+                logger.log.info("Type of sub_program_ast = %s is ast.If", subprogram_ast)
 
                 # deal with the main body of the conditional
 
                 # instantiate symbolic states for entry and exit
-                logger.log.info(f"Setting up conditional entry and exit symbolic states")
+                logger.log.info("Setting up conditional entry and exit symbolic states")
                 entry_symbolic_state: ConditionalEntrySymbolicState = ConditionalEntrySymbolicState(subprogram_ast)
                 exit_symbolic_state: ConditionalExitSymbolicState = ConditionalExitSymbolicState()
                 self._symbolic_states += [entry_symbolic_state, exit_symbolic_state]
-                logger.log.info(f"Entry state is entry_symbolic_state = {entry_symbolic_state} and exit state is exit_symbolic_state = {exit_symbolic_state}")
+                logger.log.info("Entry state is entry_symbolic_state = %s and exit state is exit_symbolic_state = %s", entry_symbolic_state, exit_symbolic_state)
                 # set the entry symbolic state as a child of the previous
-                logger.log.info(f"Adding entry_symbolic_state = {entry_symbolic_state} as a child of {previous_symbolic_state}")
+                logger.log.info("Adding entry_symbolic_state = %s as a child of %s", entry_symbolic_state, previous_symbolic_state)
                 previous_symbolic_state.add_child(entry_symbolic_state)
                 # recursive on the conditional body
-                logger.log.info(f"Recursing on body of conditional with self._subprogram_to_scfg, linking to parent entry_symbolic_state = {entry_symbolic_state}")
+                logger.log.info("Recursing on body of conditional with self._subprogram_to_scfg, linking to parent entry_symbolic_state = %s", entry_symbolic_state)
                 final_body_symbolic_state = self.subprogram_to_scfg(subprogram_ast.body, entry_symbolic_state)
                 # set the exit symbolic state as a child of the final one from the body
-                logger.log.info(f"Setting {exit_symbolic_state} as child of final_body_symbolic_state = {final_body_symbolic_state}")
+                logger.log.info("Setting %s as child of final_body_symbolic_state = %s", exit_symbolic_state, final_body_symbolic_state)
                 final_body_symbolic_state.add_child(exit_symbolic_state)
 
                 # check for orelse block
                 # if there is none, set the conditional exit vertex as a child of the entry vertex
                 # if there is, process it as a separate block
-                logger.log.info(f"Checking for length of subprogram_ast.orelse")
+                logger.log.info("Checking for length of subprogram_ast.orelse")
                 if len(subprogram_ast.orelse) != 0:
-                    logger.log.info(f"An orelse block was found - recursing with parent {entry_symbolic_state}")
+                    logger.log.info("An orelse block was found - recursing with parent %s", entry_symbolic_state)
                     # there is an orelse block - process it
                     final_orelse_symbolic_state = self.subprogram_to_scfg(subprogram_ast.orelse, entry_symbolic_state)
                     # link final state with exit state
                     final_orelse_symbolic_state.add_child(exit_symbolic_state)
                 else:
-                    logger.log.info(f"No orelse block was found - adding {exit_symbolic_state} as child of {entry_symbolic_state}")
+                    logger.log.info("No orelse block was found - adding %s as child of %s", exit_symbolic_state, entry_symbolic_state)
                     # there is no orelse block
                     entry_symbolic_state.add_child(exit_symbolic_state)
                 
@@ -230,98 +276,98 @@ class SCFG():
                 previous_symbolic_state = exit_symbolic_state
             
             elif type(subprogram_ast) is ast.Try:
-                logger.log.info(f"Type of sub_program_ast = {subprogram_ast} is ast.Try")
+                logger.log.info("Type of sub_program_ast = %s is ast.Try", subprogram_ast)
 
                 # deal with the main body and the handlers
 
                 # instantiate symbolic states for entry and exist
-                logger.log.info(f"Setting up try-except entry and exit symbolic states")
+                logger.log.info("Setting up try-except entry and exit symbolic states")
                 entry_symbolic_state: TryEntrySymbolicState = TryEntrySymbolicState(subprogram_ast)
                 exit_symbolic_state: TryExitSymbolicState = TryExitSymbolicState()
                 self._symbolic_states += [entry_symbolic_state, exit_symbolic_state]
-                logger.log.info(f"Entry state is entry_symbolic_state = {entry_symbolic_state} and exit state is exit_symbolic_state = {exit_symbolic_state}")
+                logger.log.info("Entry state is entry_symbolic_state = %s and exit state is exit_symbolic_state = %s", entry_symbolic_state, exit_symbolic_state)
                 # set the entry symbolic state as a child of the previous
-                logger.log.info(f"Adding entry_symbolic_state = {entry_symbolic_state} as a child of {previous_symbolic_state}")
+                logger.log.info("Adding entry_symbolic_state = %s as a child of %s", entry_symbolic_state, previous_symbolic_state)
                 previous_symbolic_state.add_child(entry_symbolic_state)
 
                 # recurse on the main body
-                logger.log.info(f"Recursing on body of try-except with self._subprogram_to_scfg, linking to parent entry_symbolic_state = {entry_symbolic_state}")
+                logger.log.info("Recursing on body of try-except with self._subprogram_to_scfg, linking to parent entry_symbolic_state = %s", entry_symbolic_state)
                 final_body_symbolic_state = self.subprogram_to_scfg(subprogram_ast.body, entry_symbolic_state)
                 # set the exit symbolic state as a child of the final one from the body
-                logger.log.info(f"Setting {exit_symbolic_state} as child of final_body_symbolic_state = {final_body_symbolic_state}")
+                logger.log.info("Setting %s as child of final_body_symbolic_state = %s", exit_symbolic_state, final_body_symbolic_state)
                 final_body_symbolic_state.add_child(exit_symbolic_state)
 
                 # recurse on each handler
                 for handler in subprogram_ast.handlers:
-                    logger.log.info(f"Recursing on handler of try-except with self._subprogram_to_scfg, linking to parent entry_symbolic_state = {entry_symbolic_state}")
+                    logger.log.info("Recursing on handler of try-except with self._subprogram_to_scfg, linking to parent entry_symbolic_state = %s", entry_symbolic_state)
                     final_body_symbolic_state = self.subprogram_to_scfg(handler.body, entry_symbolic_state)
                     # set the exist symbolic state as a child of the final one from the body
-                    logger.log.info(f"Setting {exit_symbolic_state} as child of final_body_symbolic_state = {final_body_symbolic_state}")
+                    logger.log.info("Setting %s as child of final_body_symbolic_state = %s", exit_symbolic_state, final_body_symbolic_state)
                     final_body_symbolic_state.add_child(exit_symbolic_state)
                 
                 # update the previous symbolic state for the next iteration
                 previous_symbolic_state = exit_symbolic_state
             
             elif type(subprogram_ast) is ast.For:
-                logger.log.info(f"Type of subprogram_ast = {subprogram_ast} is ast.For")
+                logger.log.info("Type of subprogram_ast = %s is ast.For", subprogram_ast)
 
                 # deal with the body of the for loop
 
                 # instantiate symbolic states for entry and exit
-                logger.log.info(f"Setting up for-loop entry and exit symbolic states")
+                logger.log.info("Setting up for-loop entry and exit symbolic states")
                 # derive the list of names of program variables used as loop counters
                 loop_counter_variables = extract_symbol_names_from_target(subprogram_ast.target)
-                logger.log.info(f"Loop counter variables used by the loop are {loop_counter_variables}")
+                logger.log.info("Loop counter variables used by the loop are %s", loop_counter_variables)
                 # instantiate states
                 entry_symbolic_state: ForLoopEntrySymbolicState = ForLoopEntrySymbolicState(loop_counter_variables, subprogram_ast)
                 exit_symbolic_state: ForLoopExitSymbolicState = ForLoopExitSymbolicState()
                 self._symbolic_states += [entry_symbolic_state, exit_symbolic_state]
-                logger.log.info(f"Entry state is entry_symbolic_state = {entry_symbolic_state} and exit state is exit_symbolic_state = {exit_symbolic_state}")
+                logger.log.info("Entry state is entry_symbolic_state = %s and exit state is exit_symbolic_state = %s", entry_symbolic_state, exit_symbolic_state)
                 # set the entry symbolic state as a child of the previous
-                logger.log.info(f"Adding entry_symbolic_state = {entry_symbolic_state} as a child of {previous_symbolic_state}")
+                logger.log.info("Adding entry_symbolic_state = %s as a child of %s", entry_symbolic_state, previous_symbolic_state)
                 previous_symbolic_state.add_child(entry_symbolic_state)
                 # recursive on the loop body
-                logger.log.info(f"Recursing on body of loop, linking to parent {entry_symbolic_state}")
+                logger.log.info("Recursing on body of loop, linking to parent %s", entry_symbolic_state)
                 final_body_symbolic_state = self.subprogram_to_scfg(subprogram_ast.body, entry_symbolic_state)
                 # set the exit symbolic state as a child of the final one from the body
-                logger.log.info(f"Setting exit_symbolic_state = {exit_symbolic_state} as child of block")
+                logger.log.info("Setting exit_symbolic_state = %s as child of block", exit_symbolic_state)
                 final_body_symbolic_state.add_child(exit_symbolic_state)
                 # set for loop entry symbolic state as child of final state in body
-                logger.log.info(f"Setting entry symbolic state entry_symbolic_state = {entry_symbolic_state} as child of final state {final_body_symbolic_state}")
+                logger.log.info("Setting entry symbolic state entry_symbolic_state = %s as child of final state %s", entry_symbolic_state, final_body_symbolic_state)
                 final_body_symbolic_state.add_child(entry_symbolic_state)
                 
                 # update the previous symbolic state for the next iteration
                 previous_symbolic_state = exit_symbolic_state
             
             elif type(subprogram_ast) is ast.While:
-                logger.log.info(f"Type of subprogram_ast = {subprogram_ast} is ast.While")
+                logger.log.info("Type of subprogram_ast = %s is ast.While", subprogram_ast)
 
                 # deal with the body of the while loop
 
                 # instantiate symbolic states while entry and exit
-                logger.log.info(f"Setting up while-loop entry and exit symbolic states")
+                logger.log.info("Setting up while-loop entry and exit symbolic states")
                 # instantiate states
                 entry_symbolic_state: WhileLoopEntrySymbolicState = WhileLoopEntrySymbolicState(subprogram_ast)
                 exit_symbolic_state: WhileLoopExitSymbolicState = WhileLoopExitSymbolicState()
                 self._symbolic_states += [entry_symbolic_state, exit_symbolic_state]
-                logger.log.info(f"Entry state is entry_symbolic_state = {entry_symbolic_state} and exit state is exit_symbolic_state = {exit_symbolic_state}")
+                logger.log.info("Entry state is entry_symbolic_state = %s and exit state is exit_symbolic_state = %s", entry_symbolic_state, exit_symbolic_state)
                 # set the entry symbolic state as a child of the previous
-                logger.log.info(f"Adding entry_symbolic_state = {entry_symbolic_state} as a child of previous_symbolic_state = {previous_symbolic_state}")
+                logger.log.info("Adding entry_symbolic_state = %s as a child of previous_symbolic_state = %s", entry_symbolic_state, previous_symbolic_state)
                 previous_symbolic_state.add_child(entry_symbolic_state)
                 # recursive on the loop body
-                logger.log.info(f"Recursing on body of loop, linking to parent {entry_symbolic_state}")
+                logger.log.info("Recursing on body of loop, linking to parent %s", entry_symbolic_state)
                 final_body_symbolic_state = self.subprogram_to_scfg(subprogram_ast.body, entry_symbolic_state)
                 # set the exit symbolic state as a child of the final one from the body
-                logger.log.info(f"Setting exit_symbolic_state = {exit_symbolic_state} as child of block")
+                logger.log.info("Setting exit_symbolic_state = %s as child of block", exit_symbolic_state)
                 final_body_symbolic_state.add_child(exit_symbolic_state)
                 # set for loop entry symbolic state as child of final state in body
-                logger.log.info(f"Setting entry symbolic state entry_symbolic_state = {entry_symbolic_state} as child of final state final_body_symbolic_state = {final_body_symbolic_state}")
+                logger.log.info("Setting entry symbolic state entry_symbolic_state = %s as child of final state final_body_symbolic_state = %s", entry_symbolic_state, final_body_symbolic_state)
                 final_body_symbolic_state.add_child(entry_symbolic_state)
                 
                 # update the previous symbolic state for the next iteration
                 previous_symbolic_state = exit_symbolic_state
             
-            logger.log.info(f"Moving to next iteration with previous_symbolic_state = {previous_symbolic_state}")
+            logger.log.info("Moving to next iteration with previous_symbolic_state = %s", previous_symbolic_state)
         
         # return the final symbolic state from this subprogram
         return previous_symbolic_state
@@ -331,7 +377,7 @@ class SCFG():
         """
         Write a dot file of the SCFG.
         """
-        logger.log.info(f"Writing graph filename = {filename} for SCFG.")
+        logger.log.info("Writing graph filename = %s for SCFG.", filename)
         # instantiate directed graph
         graph = graphviz.Digraph()
         graph.attr("graph", splines="true", fontsize="10")
@@ -339,7 +385,7 @@ class SCFG():
         # iterate through symbolic states, draw edges between those that are linked
         # by child/parent
         for symbolic_state in self._symbolic_states:
-            logger.log.info(f"Processing symbolic_state = {symbolic_state}")
+            logger.log.info("Processing symbolic_state = %s", symbolic_state)
             if type(symbolic_state) is StatementSymbolicState:
                 graph.node(str(id(symbolic_state)), str(symbolic_state.get_symbols_changed()), shape=shape)
             elif type(symbolic_state) is ForLoopEntrySymbolicState:
@@ -352,4 +398,4 @@ class SCFG():
                     str(id(child))
                 )
         graph.render(filename)
-        logger.log.info(f"SCFG written to file {filename}")
\ No newline at end of file
+        logger.log.info("SCFG written to file %s", filename)
\ No newline at end of file
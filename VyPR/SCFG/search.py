@@ -23,6 +23,14 @@ from VyPR.Specifications.constraints import (ValueInConcreteStateEqualsConstant,
                                             derive_sequence_of_temporal_operators)
 import VyPR.Logging.logger as logger
 
+# predicates that refer directly to symbolic states that change a symbol
+_SYMBOL_PREDICATES = (changes, calls)
+# temporal operators that search forwards from a symbolic state
+_NEXT_OPERATORS = (NextConcreteStateFromConcreteState,
+                    NextTransitionFromConcreteState,
+                    NextConcreteStateFromTransition,
+                    NextTransitionFromTransition)
+
 class SCFGSearcher():
     """
     Class to represent a map from function names to SCFGs, and then provide
@@ -33,55 +41,62 @@ class SCFGSearcher():
     def __init__(self, function_name_to_scfg_map):
         """
         Store the function_scfg_map for later.
+
+        Also precompute, for each function, the set of ids of the symbolic states in its SCFG
+        so that membership of a symbolic state in a given SCFG can be decided in constant time.
         """
         self._function_name_to_scfg_map = function_name_to_scfg_map
+        self._function_name_to_state_set = {
+            function_name: set(map(id, scfg.get_symbolic_states()))
+            for function_name, scfg in function_name_to_scfg_map.items()
+        }
+        # map from each atomic constraint seen so far to its map of sequences of temporal operators
+        self._temporal_sequence_cache = {}
     
     def find_symbolic_states(self, predicate, base_symbolic_state):
         """
         Given a predicate (and, in the case of future, a base symbolic state),
         find the relevant symbolic states.
         """
-        logger.log.info(f"Finding symbolic states satisfying predicate {predicate} based on {base_symbolic_state}")
+        logger.log.info("Finding symbolic states satisfying predicate %s based on %s", predicate, base_symbolic_state)
         # check the type of the predicate
-        if type(predicate) in [changes, calls]:
+        if type(predicate) in _SYMBOL_PREDICATES:
             # get the program symbol
             if type(predicate) is changes:
                 program_variable = predicate.get_program_variable()
             else:
                 program_variable = predicate.get_function_name()
-            logger.log.info(f"Looking for symbolic states changing the program variable {program_variable}")
+            logger.log.info("Looking for symbolic states changing the program variable %s", program_variable)
             # get the function at whose SCFG we will look
             function_name = predicate.get_during_function()
             # get the relevant SCFG
-            logger.log.info(f"Getting symbolic control-flow graph for function '{function_name}'")
+            logger.log.info("Getting symbolic control-flow graph for function '%s'", function_name)
             relevant_scfg = self._function_name_to_scfg_map[function_name]
             # get the relevant symbolic states
-            logger.log.info(f"Getting symbolic states that change the program variable '{program_variable}'")
+            logger.log.info("Getting symbolic states that change the program variable '%s'", program_variable)
             relevant_symbolic_states = relevant_scfg.get_symbolic_states_from_symbol(program_variable)
         elif type(predicate) is future:
             # find all symbolic state matching the predicate
             # with the additional constraint that they must be reachable from previous_symbolic_state
             # get the predicate
             inner_predicate = predicate.get_predicate()
-            logger.log.info(f"Inner predicate used by future is {inner_predicate}")
+            logger.log.info("Inner predicate used by future is %s", inner_predicate)
             # get the program symbol
             if type(inner_predicate) is changes:
                 program_variable = inner_predicate.get_program_variable()
             else:
                 program_variable = inner_predicate.get_function_name()
-            logger.log.info(f"Looking for symbolic states changing the program variable {program_variable}")
+            logger.log.info("Looking for symbolic states changing the program variable %s", program_variable)
             # get the function at whose SCFG we will look
             function_name = inner_predicate.get_during_function()
             # get the relevant SCFG
-            logger.log.info(f"Getting symbolic control-flow graph for function '{function_name}'")
+            logger.log.info("Getting symbolic control-flow graph for function '%s'", function_name)
             relevant_scfg = self._function_name_to_scfg_map[function_name]
             # if function_name is different from the function inside which base_symbolic_state
             # is found, we don't need to look at reachability - we just get all relevant
             # symbolic states
-            logger.log.info(f"Getting function to which symbolic state {base_symbolic_state} belongs")
-            base_function_name = self.get_function_name_of_symbolic_state(base_symbolic_state)
-            logger.log.info(f"Function to which symbolic state {base_symbolic_state} belongs is {base_function_name}")
-            if function_name == base_function_name:
+            logger.log.info("Checking whether symbolic state %s belongs to function '%s'", base_symbolic_state, function_name)
+            if self._is_state_in(base_symbolic_state, function_name):
                 logger.log.info("future predicate refers to the same function - searching forward in SCFG")
                 # consider reachability
                 # since we're looking for a symbolic state in the same SCFG,
@@ -95,21 +110,19 @@ class SCFGSearcher():
                 # don't consider reachability, since we're looking for a symbolic state in another SCFG
                 relevant_symbolic_states = relevant_scfg.get_symbolic_states_from_symbol(program_variable)
         
-        logger.log.info(f"Symbolic states found for predicate {predicate} are {relevant_symbolic_states}")
+        logger.log.info("Symbolic states found for predicate %s are %s", predicate, relevant_symbolic_states)
         
-        return relevant_symbolic_states
+        # return an immutable sequence so the result can be shared safely between callers
+        return tuple(relevant_symbolic_states)
     
-    def get_symbolic_states_from_temporal_operator(self, temporal_operator, base_symbolic_state) -> list:
+    def get_symbolic_states_from_temporal_operator(self, temporal_operator, base_symbolic_state) -> tuple:
         """
         Given a temporal operator object and a base symbolic state, either traverse
         forwards in the current symbolic control-flow graph, or search in others to determine the list of
         relevant symbolic states.
         """
         # check the type of the temporal operator
-        if type(temporal_operator) in [NextConcreteStateFromConcreteState,
-                                        NextTransitionFromConcreteState,
-                                        NextConcreteStateFromTransition,
-                                        NextTransitionFromTransition]:
+        if type(temporal_operator) in _NEXT_OPERATORS:
             # we have a Next... operator, so we have two options:
             # 1) if the function in the predicate matches the function containing base_symbolic_state,
             #    we search forwards in that function's SCFG for appropriate symbolic states, or
@@ -154,25 +167,50 @@ class SCFGSearcher():
             # the final instrument placement to adjust indices accordingly
             relevant_symbolic_states = [base_symbolic_state]
         
-        return relevant_symbolic_states
+        # return an immutable sequence so the result can be shared safely between callers
+        return tuple(relevant_symbolic_states)
+    
+    def _is_state_in(self, symbolic_state, function_name) -> bool:
+        """
+        Decide whether symbolic_state is contained by the SCFG of the function function_name.
+        """
+        return id(symbolic_state) in self._function_name_to_state_set[function_name]
     
     def get_function_name_of_symbolic_state(self, symbolic_state) -> str:
         """
         Given a symbolic state, search through self._function_name_to_scfg_map
         and return the name of the function whose SCFG contains the symbolic state.
         """
-        logger.log.info(f"Determining function that generated symbolic state {symbolic_state}")
-        # iterate through the function -> scfg map
-        for function_name in self._function_name_to_scfg_map:
+        logger.log.info("Determining function that generated symbolic state %s", symbolic_state)
+        # iterate through the function names
+        for function_name in self._function_name_to_state_set:
             # check whether symbolic_state is contained by the corresponding SCFG
-            scfg = self._function_name_to_scfg_map[function_name]
-            symbolic_states = scfg.get_symbolic_states()
             # there must be an SCFG containing the symbolic state we're searching for
             # this function cannot return None
-            if symbolic_state in symbolic_states:
-                logger.log.info(f"Found symbolic state in function '{function_name}'")
+            if self._is_state_in(symbolic_state, function_name):
+                logger.log.info("Found symbolic state in function '%s'", function_name)
                 return function_name
     
+    def _expand_frontier(self, temporal_operator, symbolic_states) -> tuple:
+        """
+        Given a temporal operator and a sequence of symbolic states, determine the symbolic states
+        identified by applying temporal_operator to each one.
+
+        Method lookups are bound before the loop, since this is run for every temporal operator
+        in every sequence derived from an atomic constraint.
+        """
+        # initialise empty list of symbolic states from the next stage of traversal
+        new_symbolic_states = []
+        # bind methods used inside the loop
+        get_next_symbolic_states = self.get_symbolic_states_from_temporal_operator
+        extend = new_symbolic_states.extend
+        # iterate through symbolic_states, adding the next ones based on temporal_operator
+        for symbolic_state in symbolic_states:
+            extend(get_next_symbolic_states(temporal_operator, symbolic_state))
+        
+        # materialise the frontier as a tuple
+        return tuple(new_symbolic_states)
+    
     def get_instrumentation_points_for_atomic_constraint(self, atomic_constraint, variable_symbolic_state_map: dict) -> dict:
         """
         Given an atomic constraint and a map from variables to symbolic states,
@@ -181,7 +219,12 @@ class SCFGSearcher():
         # initialise the empty map
         subatom_index_to_symbolic_states = {}
         # get the map of sequences of temporal operators for the atomic constraint given
-        temporal_operator_sequence_map = derive_sequence_of_temporal_operators(atomic_constraint)
+        # this map depends only on the structure of the atomic constraint, so it is computed
+        # once and reused with subsequent variable -> symbolic state maps
+        temporal_operator_sequence_map = self._temporal_sequence_cache.get(atomic_constraint)
+        if temporal_operator_sequence_map is None:
+            temporal_operator_sequence_map = derive_sequence_of_temporal_operators(atomic_constraint)
+            self._temporal_sequence_cache[atomic_constraint] = temporal_operator_sequence_map
         # for each sequence of temporal operators (1 for normal atoms, 2 for mixed atoms),
         # determine the appropriate list of symbolic states
         for subatom_index in temporal_operator_sequence_map:
@@ -197,26 +240,12 @@ class SCFGSearcher():
 
             # initialise empty list of symbolic state
             # using base_variable to get the relevant symbolic state from variable_symbolic_state_map
-            current_symbolic_states = [variable_symbolic_state_map[base_variable.get_name()]]
+            current_symbolic_states = (variable_symbolic_state_map[base_variable.get_name()],)
             # iterate through the list of temporal operators
             for temporal_operator in temporal_operator_sequence:
                 # for each symbolic state in current_symbolic_states, determine the relevant next
-                # symbolic state based on temporal_operator
-
-                # initialise empty list of symbolic states from the next stage of traversal
-                new_symbolic_states = []
-                # iterate through current_symbolic_states
-                for current_symbolic_state in current_symbolic_states:
-                    # get the list of next ones based on temporal_operator
-                    next_symbolic_states = self.get_symbolic_states_from_temporal_operator(
-                        temporal_operator,
-                        current_symbolic_state
-                    )
-                    # add to new_symbolic_states
-                    new_symbolic_states += next_symbolic_states
-                
-                # overwrite current_symbolic_states
-                current_symbolic_states = new_symbolic_states
+                # symbolic state based on temporal_operator, and overwrite current_symbolic_states
+                current_symbolic_states = self._expand_frontier(temporal_operator, current_symbolic_states)
             
             # add current_symbolic_states to the subatom index map
             subatom_index_to_symbolic_states[subatom_index] = current_symbolic_states
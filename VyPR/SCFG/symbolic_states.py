@@ -13,6 +13,11 @@ class SymbolicState():
     Base class for all types of symbolic states.
     """
 
+    __slots__ = ('_children', '_parents')
+
+    # whether instances of this class are treated as statement symbolic states
+    _IS_STATEMENT = False
+
     def __init__(self):
         self._children: list = []
         self._parents: list = []
@@ -21,35 +26,54 @@ class SymbolicState():
         return f"<{type(self).__name__} (id {id(self)})>"
     
     def is_statement_symbolic_state(self):
-        return type(self) is StatementSymbolicState
+        """
+        Decide whether self is exactly a StatementSymbolicState.
+
+        Subclasses such as ForLoopEntrySymbolicState do not count, since their
+        ast objects are not statements inside a block.
+        """
+        return self._IS_STATEMENT
     
     def add_child(self, child_symbolic_state):
         """
         Add a child symbolic state to self.
         """
-        logger.log.info(f"Appending child_symbolic_state = {child_symbolic_state} to self._children with self = {self}")
+        logger.log.info("Appending child_symbolic_state = %s to self._children with self = %s", child_symbolic_state, self)
         self._children.append(child_symbolic_state)
         # also set self as parent of child
-        logger.log.info(f"Also calling child_symbolic_state.add_parent to add self = {self} as parent of child_symbolic_state = {child_symbolic_state}")
+        logger.log.info("Also calling child_symbolic_state.add_parent to add self = %s as parent of child_symbolic_state = %s", self, child_symbolic_state)
         child_symbolic_state.add_parent(self)
     
     def add_parent(self, parent_symbolic_state):
         """
         Add a parent symbolic state to self.
         """
-        logger.log.info(f"Appending parent_symbolic_state = {parent_symbolic_state} to self._parents with self = {self}")
+        logger.log.info("Appending parent_symbolic_state = %s to self._parents with self = %s", parent_symbolic_state, self)
         self._parents.append(parent_symbolic_state)
     
-    def get_children(self) -> list:
+    def freeze(self):
+        """
+        Replace the lists of children and parents with tuples.
+
+        This should be called once the symbolic control-flow graph containing self
+        has been constructed.  Afterwards, self cannot be changed - add_child and add_parent
+        will fail, and get_children and get_parents return tuples.
+        """
+        self._children = tuple(self._children)
+        self._parents = tuple(self._parents)
+    
+    def get_children(self) -> tuple:
         return self._children
     
-    def get_parents(self) -> list:
+    def get_parents(self) -> tuple:
         return self._parents
 
 class EmptySymbolicState(SymbolicState):
     """
     A symbolic state class to be used as the root for any symbolic control-flow graph.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
@@ -58,11 +82,29 @@ class StatementSymbolicState(SymbolicState):
     A symbolic state class to be used as the state induced by a normal statement
     (such as an assignment or a function call).
     """
+    __slots__ = ('_symbols_changed', '_ast_obj')
+
+    _IS_STATEMENT = True
+
     def __init__(self, symbols_changed: list, ast_obj):
         super().__init__()
         self._symbols_changed = symbols_changed
         self._ast_obj = ast_obj
     
+    @classmethod
+    def _fast_new(cls, symbols_changed: list, ast_obj):
+        """
+        Construct an instance without going through the __init__ chain.
+
+        Every slot set by __init__ must also be set here.
+        """
+        self = object.__new__(cls)
+        self._children = []
+        self._parents = []
+        self._symbols_changed = symbols_changed
+        self._ast_obj = ast_obj
+        return self
+    
     def __repr__(self):
         return f"<SymbolicState (id {id(self)}, changes {self._symbols_changed})>"
     
@@ -77,6 +119,8 @@ class ControlFlowSymbolicState(SymbolicState):
     A symbolic state class to be used as the base class for all symbolic states
     representing control-flow.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
@@ -84,6 +128,8 @@ class ConditionalEntrySymbolicState(ControlFlowSymbolicState):
     """
     A symbolic state class to be used as the entry symbolic state for conditionals.
     """
+    __slots__ = ('_ast_obj',)
+
     def __init__(self, ast_obj):
         super().__init__()
         self._ast_obj = ast_obj
@@ -92,6 +138,8 @@ class ConditionalExitSymbolicState(ControlFlowSymbolicState):
     """
     A symbolic state class to be used as the exit symbolic state for conditionals.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
@@ -101,14 +149,20 @@ class ForLoopEntrySymbolicState(StatementSymbolicState):
 
     The constructor takes the name of the iterator used by the for loop.
     """
+    __slots__ = ()
+
+    # for-loop entries are not treated as statements, even though they change symbols
+    _IS_STATEMENT = False
+
     def __init__(self, loop_counter_variables, ast_obj):
         super().__init__(loop_counter_variables, ast_obj)
-        self._ast_obj = ast_obj
 
 class ForLoopExitSymbolicState(ControlFlowSymbolicState):
     """
     A symbolic state class to be used as the exit symbolic state for for-loops.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
@@ -116,6 +170,8 @@ class WhileLoopEntrySymbolicState(ControlFlowSymbolicState):
     """
     A symbolic state class to be used as the entry symbolic state for while-loops.
     """
+    __slots__ = ('_ast_obj',)
+
     def __init__(self, ast_obj):
         super().__init__()
         self._ast_obj = ast_obj
@@ -124,6 +180,8 @@ class WhileLoopExitSymbolicState(ControlFlowSymbolicState):
     """
     A symbolic state class to be used as the exit symbolic state for while-loops.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
@@ -131,6 +189,8 @@ class TryEntrySymbolicState(ControlFlowSymbolicState):
     """
     A symbolic state class to be used as the entry symbolic state for try-excepts.
     """
+    __slots__ = ('_ast_obj',)
+
     def __init__(self, ast_obj):
         super().__init__()
         self._ast_obj = ast_obj
@@ -139,5 +199,7 @@ class TryExitSymbolicState(ControlFlowSymbolicState):
     """
     A symbolic state class to be used as the exit symbolic state for try-excepts.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
\ No newline at end of file
@@ -6,11 +6,46 @@ Developed by Dr. Joshua Heneage Dawes.
 Module to provide utility functions for SCFG construction.
 """
 import ast
+import sys
 
 import VyPR.Logging.logger as logger
 
 from VyPR.SCFG.symbolic_states import SymbolicState, StatementSymbolicState
 
+def _walk(node) -> list:
+    """
+    Given an object from a program ast, return the list of all nodes in that ast,
+    in the same (breadth-first) order as ast.walk.
+
+    Nodes are accumulated in a single list that is extended while it is iterated over,
+    which avoids the deque and generator used by ast.walk.
+    """
+    nodes = [node]
+    extend = nodes.extend
+    iter_child_nodes = ast.iter_child_nodes
+    for current_node in nodes:
+        extend(iter_child_nodes(current_node))
+    return nodes
+
+def _names_in(node, out: list):
+    """
+    Given an object from a program ast, append the identifier of each ast.Name instance
+    found in that ast to out, in the same order as a filter over ast.walk would.
+
+    The children of ast.Name instances are not visited, since they can contain no further names.
+    """
+    nodes = [node]
+    extend = nodes.extend
+    append = out.append
+    iter_child_nodes = ast.iter_child_nodes
+    Name = ast.Name
+    intern = sys.intern
+    for current_node in nodes:
+        if type(current_node) is Name:
+            append(intern(current_node.id))
+        else:
+            extend(iter_child_nodes(current_node))
+
 def process_assignment_ast(stmt_ast: ast.Assign, stmt_ast_parent_block):
         """
         Instantiate a new SymbolicState instance based on this assignment statement.
@@ -19,28 +54,31 @@ def process_assignment_ast(stmt_ast: ast.Assign, stmt_ast_parent_block):
         of the assignment, will be included as symbols changed by that Symbolic State
         """
         logger.log.info("Generating SymbolicState instance from assignment ast")
-        # first, add a reference from stmt_ast to its parent block
-        stmt_ast.parent_block = stmt_ast_parent_block
-        logger.log.info("Instantiating symbolic state for AST instance stmt_ast = %s" % stmt_ast)
-        # determine the program variables assigned on the left-hand-side
-        targets: list = stmt_ast.targets
-        # extract names - for now just care about normal program variables, not attributes or functions
+        # first, add a reference from stmt_ast to its parent block, unless it's already there
+        if getattr(stmt_ast, 'parent_block', None) is not stmt_ast_parent_block:
+            stmt_ast.parent_block = stmt_ast_parent_block
+        logger.log.info("Instantiating symbolic state for AST instance stmt_ast = %s", stmt_ast)
+        # initialise a single list of symbols to which both target names and function names are added
+        all_symbols: list = []
+        append = all_symbols.append
+        # extract names from the targets on the left-hand-side
+        # for now just care about normal program variables, not attributes or functions
         logger.log.info("Extracting list of assignment target names")
-        target_names: list = []
-        for target in targets:
-            target_names += extract_symbol_names_from_target(target)
-        logger.log.info("List of all program variables changed is %s" % target_names)
-        # extract function names
-        assigned_value = stmt_ast.value
-        function_names: list = extract_function_names(assigned_value)
-        logger.log.info("List of all program functions called is %s" % function_names)
-        # merge the two lists of symbols
-        logger.log.info("Merging lists of assignment target names and function names")
-        all_symbols: list = target_names + function_names
-        logger.log.info("List of all symbols to mark as changed in the symbolic state is %s" % all_symbols)
+        for target in stmt_ast.targets:
+            # a single name is the most common target, and needs no walk
+            if type(target) is ast.Name:
+                append(sys.intern(target.id))
+            else:
+                _names_in(target, all_symbols)
+        # extract names of functions called on the right-hand-side
+        logger.log.info("Extracting list of function names called on the right-hand-side")
+        for walked_ast in _walk(stmt_ast.value):
+            if type(walked_ast) is ast.Call and type(walked_ast.func) is ast.Name:
+                append(sys.intern(walked_ast.func.id))
+        logger.log.info("List of all symbols to mark as changed in the symbolic state is %s", all_symbols)
         # set up a SymbolicState instance
-        logger.log.info("Instantiating new StatementSymbolicState instance with all_symbols = %s" % all_symbols)
-        symbolic_state: SymbolicState = StatementSymbolicState(all_symbols, stmt_ast)
+        logger.log.info("Instantiating new StatementSymbolicState instance with all_symbols = %s", all_symbols)
+        symbolic_state: SymbolicState = StatementSymbolicState._fast_new(all_symbols, stmt_ast)
         return symbolic_state
     
 def process_expression_ast(stmt_ast: ast.Expr, stmt_ast_parent_block):
@@ -49,20 +87,18 @@ def process_expression_ast(stmt_ast: ast.Expr, stmt_ast_parent_block):
 
     TODO: handle more complex ast structures for forming names, for example obj.subobj.var.
     """
-    # first, add a reference from stmt_ast to its parent block
-    stmt_ast.parent_block = stmt_ast_parent_block
-    logger.log.info(f"Instantiating a symbolic state for AST instance stmt_ast = {stmt_ast}")
+    # first, add a reference from stmt_ast to its parent block, unless it's already there
+    if getattr(stmt_ast, 'parent_block', None) is not stmt_ast_parent_block:
+        stmt_ast.parent_block = stmt_ast_parent_block
+    logger.log.info("Instantiating a symbolic state for AST instance stmt_ast = %s", stmt_ast)
     # initialise empty list of symbols
     all_symbols: list = []
     # walk the ast to find the symbols used
-    for walked_ast in ast.walk(stmt_ast):
-        # extract information according to type
-        if type(walked_ast) is ast.Name:
-            all_symbols.append(walked_ast.id)
+    _names_in(stmt_ast, all_symbols)
     
     # instantiate symbolic state
-    logger.log.info(f"Instantiating new StatementSymbolicState instance with symbols {all_symbols}")
-    symbolic_state: SymbolicState = StatementSymbolicState(all_symbols, stmt_ast)
+    logger.log.info("Instantiating new StatementSymbolicState instance with symbols %s", all_symbols)
+    symbolic_state: SymbolicState = StatementSymbolicState._fast_new(all_symbols, stmt_ast)
     return symbolic_state
 
 def extract_symbol_names_from_target(subast) -> list:
@@ -70,12 +106,15 @@ def extract_symbol_names_from_target(subast) -> list:
     Given an object from a program ast, extract string representations of the names
     of the symbols used in that ast.
     """
+    # a single name is the most common target, and needs no walk
+    if type(subast) is ast.Name:
+        return [sys.intern(subast.id)]
     # initialise an empty list of the symbol names
     symbol_names = []
     # walk the target object to look for ast.Name instances
-    for walked_ast in ast.walk(subast):
+    for walked_ast in _walk(subast):
         if type(walked_ast) is ast.Name:
-            symbol_names.append(walked_ast.id)
+            symbol_names.append(sys.intern(walked_ast.id))
     return symbol_names
 
 def extract_function_names(subast) -> list:
@@ -86,8 +125,8 @@ def extract_function_names(subast) -> list:
     # initialise an empty list of the function names
     function_names = []
     # walk the ast and extract function names
-    for walked_ast in ast.walk(subast):
+    for walked_ast in _walk(subast):
         if type(walked_ast) is ast.Call:
             if type(walked_ast.func) is ast.Name:
-                function_names.append(walked_ast.func.id)
+                function_names.append(sys.intern(walked_ast.func.id))
     return function_names
\ No newline at end of file
@@ -15,19 +15,23 @@ There can arbitrarily many Forall instances nested.
 
 The final instance in the chain must be a Constraint instance.  This has recursive structure (based on the grammar of iCFTL).
 """
+import functools
 import logging
+from types import LambdaType, MappingProxyType
+from weakref import WeakValueDictionary
 logger = logging.getLogger("VyPR")
 
 from VyPR.Specifications.predicates import changes, calls, future
 from VyPR.Specifications.constraints import (Constraint,
-                                            ConstraintBase,
-                                            ConcreteStateExpression,
-                                            TransitionExpression,
+                                            is_complete,
                                             ConcreteStateVariable,
                                             TransitionVariable,
                                             Conjunction,
                                             Disjunction,
                                             Negation,
+                                            KIND_CONJUNCTION,
+                                            KIND_DISJUNCTION,
+                                            KIND_NEGATION,
                                             TimeBetween,
                                             ValueInConcreteStateEqualsConstant,
                                             ValueInConcreteStateLessThanConstant,
@@ -42,14 +46,80 @@ from VyPR.Specifications.constraints import (Constraint,
                                             NextConcreteStateFromTransition,
                                             TimeBetweenLessThanConstant)
 
+# predicate types allowed in the first quantifier of a specification
+_QUANTIFIER_PREDICATE_TYPES = (changes, calls, future)
+
+# variable objects hold nothing but a name, so equal ones are shared
+# while any specification still refers to them
+_variable_objs = WeakValueDictionary()
+
+def _make_variable_obj(variable_class, name: str):
+    """
+    Given a variable class and a variable name, return the shared instance
+    of that class for that name, creating it if necessary.
+    """
+    key = (variable_class, name)
+    variable_obj = _variable_objs.get(key)
+    if variable_obj is None:
+        variable_obj = variable_class(name)
+        _variable_objs[key] = variable_obj
+    return variable_obj
+
+def _validate_quantified(quantified_variable: dict, allowed_types: tuple):
+    """
+    Given the keyword arguments passed to a forall call, check that they contain a single variable,
+    that the type of its predicate is one of allowed_types, and that the predicate is complete.
+
+    An exception is raised only if one of these checks fails.
+    """
+    # if there is not exactly 1 variable, raise an exception
+    if len(quantified_variable) != 1:
+        raise Exception("A single variable must be given for each level of universal quantification.")
+
+    # check the type of the value
+    (variable, predicate), = quantified_variable.items()
+    if type(predicate) not in allowed_types:
+        raise Exception(f"Type '{type(predicate).__name__}' not supported.")
+
+    # make sure the predicate is complete - for future, this is decided by the predicate it contains
+    base_predicate = predicate._predicate if type(predicate) is future else predicate
+    if not base_predicate._during_function:
+        raise Exception(f"Predicate used for variable {variable} not complete")
+
+def _cached(method):
+    """
+    Decorator for Specification methods whose result depends only on the structure of the specification.
+
+    The result is stored in the specification's cache under the name of the method,
+    and is reused until the specification is next modified.
+    """
+    name = method.__name__
+    @functools.wraps(method)
+    def cached_method(self):
+        # check for a result computed by a previous call
+        if name in self._cache:
+            return self._cache[name]
+        # compute the result and store it
+        result = method(self)
+        self._cache[name] = result
+        return result
+    return cached_method
+
 class Specification():
     """
     The top-level class for specifications.
     """
+    __slots__ = ('_quantifier', '_chain', '_terminal_constraint', '_cache')
 
     def __init__(self):
         logger.info("Instantiating new specification...")
         self._quantifier = None
+        # the sequence of quantifiers in the specification, in order of nesting
+        self._chain: list = []
+        # the constraint given to the innermost quantifier
+        self._terminal_constraint = None
+        # cache for the results of traversals, reset whenever the specification changes
+        self._cache = {}
     
     def __repr__(self):
         """
@@ -60,195 +130,107 @@ class Specification():
     def get_quantifier(self):
         return self._quantifier
     
+    def _invalidate_cache(self):
+        """
+        Discard the results of any previous traversals.  This must be called
+        whenever a quantifier or constraint is added to the specification.
+        """
+        self._cache.clear()
+    
+    @_cached
+    def _compute_variables(self) -> tuple:
+        """
+        Traverse the chain of quantifiers once to construct both the list of variables
+        and the map from each variable to the object it will hold.
+
+        The result is cached until the specification is next modified, so it is stored as a tuple
+        and a read-only view of the map, which callers cannot modify.
+        """
+        logger.info("Deriving variables and map variable names -> variable object from quantifiers")
+        # initialise an empty list and an empty map
+        variables = []
+        variable_to_obj = {}
+        # the structure is always Specification -> Forall -> ... -> Forall -> Constraint,
+        # so we iterate through the chain of quantifiers, each of which has already
+        # decided the kind of object its variable will hold
+        logger.info("Traversing specification structure")
+        for quantifier in self._chain:
+            # every quantifier introduces exactly one variable
+            variables.append(quantifier._variable)
+            if quantifier._variable_obj is not None:
+                variable_to_obj[quantifier._variable] = quantifier._variable_obj
+        
+        logger.info("variable_to_obj = %s", variable_to_obj)
+        
+        return tuple(variables), MappingProxyType(variable_to_obj)
+    
     def get_variable_to_obj_map(self) -> dict:
         """
-        Traverse the specification in order to construct a map
-        from each variable to the type of object it will hold
+        Get the map from each variable to the type of object it will hold
         (either a ConcreteState or a Transition instance).
 
         Note: this function should not try to serialise any objects from the specification
         because serialisation of a Constraint instance requires calling of this function,
         hence the result would be an infinite loop.
+
+        A new dictionary is returned on each call, so callers can modify it without affecting the specification.
         """
-        logger.info("Deriving map variable names -> variable object from quantifiers")
-        # initialise an empty map
-        variable_to_obj = {}
-        # set the current object to be the top-level specification
-        current_obj = self
-        # iterate through the structure, using the type Constraint as a place to stop
-        logger.info("Traversing specification structure")
-        while type(current_obj) is not Constraint:
-            logger.info(f"current_obj = {type(current_obj)}")
-            # traverse depending on the type of the current object
-            if type(current_obj) is Specification:
-                current_obj = current_obj._quantifier
-            elif type(current_obj) is Forall:
-                # first, add to the map
-                # we check the type of the predicate so we know what kind of variable to instantiate
-                if type(current_obj._predicate) is changes:
-                    variable_to_obj[current_obj._variable] = ConcreteStateVariable(current_obj._variable)
-                elif type(current_obj._predicate) is calls:
-                    variable_to_obj[current_obj._variable] = TransitionVariable(current_obj._variable)
-                elif type(current_obj._predicate) is future:
-                    if type(current_obj._predicate._predicate) is changes:
-                        variable_to_obj[current_obj._variable] = ConcreteStateVariable(current_obj._variable)
-                    elif type(current_obj._predicate._predicate) is calls:
-                        variable_to_obj[current_obj._variable] = TransitionVariable(current_obj._variable)
-                # in the case of a quantifier, the two possibilities are
-                # that the next item to consider is a quantifier or a constraint
-                if current_obj._quantifier:
-                    current_obj = current_obj._quantifier
-                else:
-                    # if we arrive at a constraint, the loop
-                    # will stop at the next ieration
-                    current_obj = current_obj._constraint
-        
-        logger.info(f"variable_to_obj = {variable_to_obj}")
-        
-        return variable_to_obj
+        return dict(self._compute_variables()[1])
     
     def get_variables(self) -> list:
         """
-        Traverse the specification in order to construct a list of variables.
+        Get the list of variables.
 
         The order of the list matches the order in which the variables occur in quantifiers.
+
+        A new list is returned on each call, so callers can modify it without affecting the specification.
         """
-        logger.info("Deriving list of variables from quantifiers")
-        # initialise an empty list
-        variables = []
-        # set the current object to be the top-level specification
-        current_obj = self
-        # iterate through the structure, using the type Constraint as a place to stop
-        logger.info("Traversing specification structure")
-        while type(current_obj) is not Constraint:
-            logger.info(f"current_obj = {type(current_obj)}")
-            # traverse depending on the type of the current object
-            if type(current_obj) is Specification:
-                current_obj = current_obj._quantifier
-            elif type(current_obj) is Forall:
-                # first, add to the map
-                # we check the type of the predicate so we know what kind of variable to instantiate
-                if type(current_obj._predicate) is changes:
-                    variables.append(current_obj._variable)
-                elif type(current_obj._predicate) is calls:
-                    variables.append(current_obj._variable)
-                elif type(current_obj._predicate) is future:
-                    if type(current_obj._predicate._predicate) is changes:
-                        variables.append(current_obj._variable)
-                    elif type(current_obj._predicate._predicate) is calls:
-                        variables.append(current_obj._variable)
-                # in the case of a quantifier, the two possibilities are
-                # that the next item to consider is a quantifier or a constraint
-                if current_obj._quantifier:
-                    current_obj = current_obj._quantifier
-                else:
-                    # if we arrive at a constraint, the loop
-                    # will stop at the next ieration
-                    current_obj = current_obj._constraint
-        
-        return variables
+        return list(self._compute_variables()[0])
     
-    def get_function_names_used(self):
+    @_cached
+    def get_function_names_used(self) -> list:
         """
         Traverse the specification and, each time a predicate is encountered, extract the function
         name used and add to the list.
         """
-        # initialise an empty list of function names
-        all_function_names = []
+        # initialise an empty set of function names
+        all_function_names: set = set()
         # initialise stack wth top-level Specification object for traversal
         stack = [self]
         # process the stack while it is not empty
-        while len(stack) > 0:
+        while stack:
             # get the top element from the stack
             top = stack.pop()
             # based on the type, add child elements to the stack or add a new function name
-            # to the list
-            if type(top) in [changes, calls]:
-                all_function_names.append(top._during_function)
-            elif type(top) is future:
-                stack.append(top.get_predicate())
-            elif type(top) is Specification:
-                stack.append(top.get_quantifier())
-            elif type(top) is Forall:
-                # add the predicate to the stack
-                stack.append(top.get_predicate())
-                # also, carry on traversing the specification
-                if top.get_quantifier():
-                    stack.append(top.get_quantifier())
-                else:
-                    stack.append(top.get_constraint())
-            elif type(top) is Constraint:
-                stack.append(top.instantiate())
-            elif type(top) is Conjunction:
-                stack += top.get_conjuncts()
-            elif type(top) is Disjunction:
-                stack += top.get_disjuncts()
-            elif type(top) is Negation:
-                stack.append(top.get_operand())
-            elif type(top) in [ValueInConcreteStateEqualsConstant, ValueInConcreteStateLessThanConstant, ValueInConcreteStateGreaterThanConstant]:
-                stack.append(top.get_value_expression().get_concrete_state_expression())
-            elif type(top) in [ConcreteStateBeforeTransition, ConcreteStateAfterTransition]:
-                stack.append(top.get_transition_expression())
-            elif type(top) in [DurationOfTransitionLessThanConstant, DurationOfTransitionGreaterThanConstant]:
-                stack.append(top.get_transition_duration_obj().get_transition_expression())
-            elif type(top) in [NextTransitionFromConcreteState, NextConcreteStateFromConcreteState]:
-                stack.append(top.get_predicate())
-            elif type(top) in [NextTransitionFromTransition, NextConcreteStateFromTransition]:
-                stack.append(top.get_predicate())
-            elif type(top) is TimeBetweenLessThanConstant:
-                # traverse both arguments to the timeBetween operator
-                stack.append(top.get_time_between_expression().get_lhs_expression())
-                stack.append(top.get_time_between_expression().get_rhs_expression())
-        
-        all_function_names = list(set(all_function_names))
+            # to the set
+            handler = _FUNCTION_NAME_HANDLERS.get(type(top))
+            if handler:
+                handler(top, stack, all_function_names)
             
-        return all_function_names
+        return list(all_function_names)
     
     def get_constraint(self):
         """
-        Traverse the specification until a constraint is reached.
+        Get the constraint at the end of the chain of quantifiers.
         """
-        # set the current object to be the first quantifier
-        current_obj = self._quantifier
-        # iterate through the structure, using the type Constraint as a place to stop
-        while type(current_obj) is not Constraint:
-            # traverse depending on the type of the current object
-            if type(current_obj) is Specification:
-                current_obj = current_obj.get_quantifier()
-            elif type(current_obj) is Forall:
-                # in the case of a quantifier, the two possibilities are
-                # that the next item to consider is a quantifier or a constraint
-                if current_obj.get_quantifier():
-                    current_obj = current_obj.get_quantifier()
-                else:
-                    # if we arrive at a constraint, the loop
-                    # will stop at the next ieration
-                    current_obj = current_obj.get_constraint()
-        return current_obj
+        return self._terminal_constraint
 
     def forall(self, **quantified_variable):
         """
         **quantified variable must be a dictionary with only one key - the variable being given.
         The value associated with the variable must be a Predicate instance.
         """
-        # if there is more than 1 variable, raise an exception
-        if len(quantified_variable.keys()) > 1:
-            raise Exception("A single variable must be given for each level of universal quantification.")
-
-        # check the type of the value
-        predicate = list(quantified_variable.values())[0]
-        if type(predicate) not in [changes, calls, future]:
-            raise Exception(f"Type '{type(predicate).__name__}' not supported.")
-
-        # make sure the predicate is complete
-        variable = list(quantified_variable.keys())[0]
-        if not predicate._during_function:
-            raise Exception(f"Predicate used for variable {variable} not complete")
+        # check that a single, complete predicate of a supported type is given
+        _validate_quantified(quantified_variable, _QUANTIFIER_PREDICATE_TYPES)
 
         logger.info(f"Adding quantifier with arguments {quantified_variable}")
 
-        # store the quantifier
+        # store the quantifier, invalidating any cached traversals
+        self._invalidate_cache()
         self._quantifier = Forall(self, **quantified_variable)
+        # the new quantifier starts a new chain
+        self._chain = [self._quantifier]
+        self._terminal_constraint = None
 
         return self._quantifier
 
@@ -256,6 +238,7 @@ class Forall():
     """
     The class for representing universal quantification in specifications.
     """
+    __slots__ = ('_specification_obj', '_constraint', '_quantifier', '_variable', '_predicate', '_variable_obj')
 
     def __init__(self, specification_obj: Specification, **quantified_variable):
         self._specification_obj = specification_obj
@@ -263,11 +246,18 @@ class Forall():
         # to determine what the next thing we will see in the structure of the specification is
         self._constraint = None
         self._quantifier = None
-        # Note: .keys() does not give a structure with an ordering,
-        # so normally converting to a list would be problematic
-        # but here we know that there must be one element
-        self._variable = list(quantified_variable.keys())[0]
-        self._predicate = list(quantified_variable.values())[0]
+        # Note: we know that quantified_variable has a single item,
+        # so we take the variable and predicate from it in one step
+        (self._variable, self._predicate), = quantified_variable.items()
+        # decide the kind of object the variable will hold now, since the predicate is fixed
+        # for future, the kind of variable is decided by the predicate it contains
+        inner_predicate = self._predicate._predicate if type(self._predicate) is future else self._predicate
+        if type(inner_predicate) is changes:
+            self._variable_obj = _make_variable_obj(ConcreteStateVariable, self._variable)
+        elif type(inner_predicate) is calls:
+            self._variable_obj = _make_variable_obj(TransitionVariable, self._variable)
+        else:
+            self._variable_obj = None
     
     def __repr__(self):
         if self._constraint:
@@ -297,25 +287,20 @@ class Forall():
         **quantified variable must be a dictionary with only one key - the variable being given.
         The value associated with the variable must be a Predicate instance.
         """
-        # if there is more than 1 variable, raise an exception
-        if len(quantified_variable.keys()) > 1:
-            raise Exception("A single variable must be given for each level of universal quantification.")
-
-        # check the type of the value - this is not the first quantifier,
+        # check that a single, complete predicate is given - this is not the first quantifier,
         # so the type must be future
-        predicate = list(quantified_variable.values())[0]
-        if type(predicate) is not future:
-            raise Exception(f"Type '{type(predicate).__name__}' not supported.")
-
-        # make sure the predicate is complete
-        variable = list(quantified_variable.keys())[0]
-        if not predicate._predicate._during_function:
-            raise Exception(f"Predicate used for variable {variable} not complete")
+        _validate_quantified(quantified_variable, (future,))
 
         logger.info(f"Initialising new instance of Forall with quantified_variable = {quantified_variable}")
 
-        # store the quantifier
+        # store the quantifier, invalidating any cached traversals
+        self._specification_obj._invalidate_cache()
         self._quantifier = Forall(self._specification_obj, **quantified_variable)
+        # the new quantifier replaces anything nested inside self in the chain
+        chain = self._specification_obj._chain
+        del chain[chain.index(self) + 1:]
+        chain.append(self._quantifier)
+        self._specification_obj._terminal_constraint = None
 
         return self._quantifier
     
@@ -326,15 +311,95 @@ class Forall():
         The lambda will later be called and supplied with the necessary variables during instrumentation and monitoring.
         """
         # make sure constraint is a lambda
-        if type(expression) is not type(lambda:0):
+        if type(expression) is not LambdaType:
             raise Exception("Constraint given must be a lambda expression.")
 
         logger.info("Setting self._constraint to new Constraint instance")
 
+        # invalidate any cached traversals before modifying the specification
+        self._specification_obj._invalidate_cache()
         self._constraint = Constraint(self._specification_obj, expression)
+        # the constraint only ends the chain if self is the innermost quantifier
+        if self._specification_obj._chain[-1] is self:
+            self._specification_obj._terminal_constraint = self._constraint
 
         return self._specification_obj
 
+"""
+Handlers used by Specification.get_function_names_used.
+
+Each takes the object being processed, the traversal stack and the set of function names found so far.
+"""
+
+def _add_function_name(top, stack, function_names):
+    function_names.add(top._during_function)
+
+def _push_predicate(top, stack, function_names):
+    stack.append(top.get_predicate())
+
+def _push_quantifier(top, stack, function_names):
+    stack.append(top.get_quantifier())
+
+def _push_forall_children(top, stack, function_names):
+    # add the predicate to the stack
+    stack.append(top.get_predicate())
+    # also, carry on traversing the specification
+    if top.get_quantifier():
+        stack.append(top.get_quantifier())
+    else:
+        stack.append(top.get_constraint())
+
+def _push_instantiated_constraint(top, stack, function_names):
+    stack.append(top.get_instantiated())
+
+def _push_conjuncts(top, stack, function_names):
+    stack.extend(top.get_conjuncts())
+
+def _push_disjuncts(top, stack, function_names):
+    stack.extend(top.get_disjuncts())
+
+def _push_operand(top, stack, function_names):
+    stack.append(top.get_operand())
+
+def _push_value_concrete_state(top, stack, function_names):
+    stack.append(top.get_value_expression().get_concrete_state_expression())
+
+def _push_transition_expression(top, stack, function_names):
+    stack.append(top.get_transition_expression())
+
+def _push_duration_transition(top, stack, function_names):
+    stack.append(top.get_transition_duration_obj().get_transition_expression())
+
+def _push_time_between_expressions(top, stack, function_names):
+    # traverse both arguments to the timeBetween operator
+    stack.append(top.get_time_between_expression().get_lhs_expression())
+    stack.append(top.get_time_between_expression().get_rhs_expression())
+
+# map from each type encountered in a specification to its handler
+_FUNCTION_NAME_HANDLERS = {
+    changes: _add_function_name,
+    calls: _add_function_name,
+    future: _push_predicate,
+    Specification: _push_quantifier,
+    Forall: _push_forall_children,
+    Constraint: _push_instantiated_constraint,
+    Conjunction: _push_conjuncts,
+    Disjunction: _push_disjuncts,
+    Negation: _push_operand,
+    ValueInConcreteStateEqualsConstant: _push_value_concrete_state,
+    ValueInConcreteStateLessThanConstant: _push_value_concrete_state,
+    ValueInConcreteStateGreaterThanConstant: _push_value_concrete_state,
+    ConcreteStateBeforeTransition: _push_transition_expression,
+    ConcreteStateAfterTransition: _push_transition_expression,
+    DurationOfTransitionLessThanConstant: _push_duration_transition,
+    DurationOfTransitionGreaterThanConstant: _push_duration_transition,
+    NextTransitionFromConcreteState: _push_predicate,
+    NextConcreteStateFromConcreteState: _push_predicate,
+    NextTransitionFromTransition: _push_predicate,
+    NextConcreteStateFromTransition: _push_predicate,
+    TimeBetweenLessThanConstant: _push_time_between_expressions
+}
+
 """
 Syntax sugar functions.
 """
@@ -342,32 +407,67 @@ Syntax sugar functions.
 def all_are_true(*conjuncts):
     """
     Encode a conjunction.
+
+    A conjunction of a single constraint is just that constraint, so no Conjunction is built.
     """
+    if len(conjuncts) == 1 and is_complete(conjuncts[0]):
+        return conjuncts[0]
     return Conjunction(*conjuncts)
 
 def one_is_true(*disjuncts):
     """
     Encode a disjunction.
+
+    A disjunction of a single constraint is just that constraint, so no Disjunction is built.
     """
+    if len(disjuncts) == 1 and is_complete(disjuncts[0]):
+        return disjuncts[0]
     return Disjunction(*disjuncts)
 
 def not_true(operand):
     """
     Given an operand, instantiate either a single negation,
     or another structure by propagating negation through to atomic constraints.
+
+    The structure is traversed in post-order using an explicit stack, so deeply nested
+    operands do not hit the recursion limit.
     """
-    if type(operand) is Conjunction:
-        # rewrite negation of conjunction as disjunction of negations
-        return Disjunction(*map(lambda conjunct : not_true(conjunct), operand.get_conjuncts()))
-    elif type(operand) is Disjunction:
-        # rewrite negation of disjunction as conjunction of negations
-        return Conjunction(*map(lambda disjunct : not_true(disjunct), operand.get_disjuncts()))
-    elif type(operand) is Negation:
-        # eliminate double negation
-        return operand.get_operand()
-    else:
-        # assume operand is atomic constraint
-        return Negation(operand)
+    # children of connectives are checked on construction, so only the operand itself needs checking
+    if not is_complete(operand):
+        raise Exception(f"Operand {operand} for negation is not complete")
+    # stack of (constraint, whether its children have already been pushed)
+    stack = [(operand, False)]
+    # stack of negated constraints, in the order in which they are completed
+    results = []
+    while stack:
+        current_obj, expanded = stack.pop()
+        kind = current_obj._KIND
+        if kind == KIND_CONJUNCTION or kind == KIND_DISJUNCTION:
+            children = current_obj.get_conjuncts() if kind == KIND_CONJUNCTION else current_obj.get_disjuncts()
+            if not expanded:
+                # come back to current_obj once all of its children have been negated
+                stack.append((current_obj, True))
+                # push the children in reverse, so they are negated in their original order
+                stack += [(child, False) for child in reversed(children)]
+            else:
+                # the negated children are at the top of the results stack
+                start = len(results) - len(children)
+                negated_children = results[start:]
+                del results[start:]
+                if kind == KIND_CONJUNCTION:
+                    # rewrite negation of conjunction as disjunction of negations
+                    results.append(Disjunction.from_iterable(negated_children))
+                else:
+                    # rewrite negation of disjunction as conjunction of negations
+                    results.append(Conjunction.from_iterable(negated_children))
+        elif kind == KIND_NEGATION:
+            # eliminate double negation
+            results.append(current_obj.get_operand())
+        else:
+            # assume current_obj is atomic constraint
+            results.append(Negation(current_obj))
+    
+    return results[0]
 
 def timeBetween(concrete_state_expression_1, concrete_state_expression_2):
     return TimeBetween(concrete_state_expression_1, concrete_state_expression_2)
\ No newline at end of file
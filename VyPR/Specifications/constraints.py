@@ -12,38 +12,117 @@ forall q in changes(x) : q(x) < 10
 q(x) < 10 is a constraint and is represented using the classes in this module.
 """
 
+import functools
+import operator
+import sys
+from weakref import WeakValueDictionary
+
 from VyPR.Specifications.predicates import changes, calls
 import VyPR.Logging.logger as logger
 
+# types of constants that durations and lengths can be compared with
+# these tuples are checked with type(x) in ..., rather than isinstance, so that bool
+# (a subclass of int) is only accepted where it is listed explicitly
+_NUMERIC = (int, float)
+# types of constants that values can be compared with
+_SCALAR = (int, float, str)
+# types of constants that values can be checked for equality with
+_SCALAR_BOOL = (int, float, str, bool)
+
+# kinds of constraint node, stored on each class as _KIND so that traversals can
+# dispatch with a single attribute lookup rather than a sequence of type checks
+KIND_CONJUNCTION = 0
+KIND_DISJUNCTION = 1
+KIND_NEGATION = 2
+KIND_NORMAL_ATOM = 3
+KIND_MIXED_ATOM = 4
+
+# expression nodes that have already been constructed, keyed by class, the identity
+# of the expression they are built on and any further fields
+_expression_nodes = WeakValueDictionary()
+
+def _hash_cons(node_class, expression, *fields):
+    """
+    Given an expression node class, the expression it is built on and any further fields,
+    return the existing node with the same structure if there is one, or construct a new one.
+
+    Keying on the identity of expression is safe because each node holds a reference to its
+    expression, so the identity cannot be reused while the node is alive.
+    """
+    key = (node_class, id(expression)) + fields
+    node = _expression_nodes.get(key)
+    if node is None:
+        node = node_class(expression, *fields)
+        _expression_nodes[key] = node
+    return node
+
+def _cached_repr(repr_method):
+    """
+    Decorator for the __repr__ method of classes whose instances are not modified after construction.
+
+    The string is computed on the first call and stored on the instance for subsequent calls.
+    """
+    @functools.wraps(repr_method)
+    def cached_repr(self):
+        try:
+            return self._repr
+        except AttributeError:
+            self._repr = repr_method(self)
+            return self._repr
+    return cached_repr
+
+def _cached_hash(hash_method):
+    """
+    Decorator for the __hash__ method of classes whose instances are not modified after construction.
+
+    The hash is computed on the first call and stored on the instance for subsequent calls.
+    """
+    @functools.wraps(hash_method)
+    def cached_hash(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash_method(self)
+            return self._hash
+    return cached_hash
+
 def _is_constraint_base(obj):
     """
-    Decide whether obj has ConstraintBase as a base class.
+    Decide whether obj is an instance of a class derived from ConstraintBase.
     """
-    return ConstraintBase in type(obj).__bases__
+    return isinstance(obj, ConstraintBase)
 
 def _is_connective(obj):
     """
     Decide whether obj is a logical connective (and, or, not).
     """
-    return type(obj) in [Conjunction, Disjunction, Negation]
+    return obj.__class__ in _CONNECTIVES
 
 def is_complete(obj):
     """
     Decide whether obj is complete, or needs to be completed by further method calls.
     """
-    return _is_connective(obj) or _is_constraint_base(obj)
+    # connectives are also derived from ConstraintBase, so a single check covers both cases
+    # this is called for every operand of every connective, so the check is made here directly
+    return isinstance(obj, ConstraintBase)
 
 def is_normal_atom(obj):
     """
     Decide whether an atomic constraint is normal (it requires only one measurement).
     """
-    return NormalAtom in type(obj).__bases__
+    return isinstance(obj, NormalAtom)
 
 def is_mixed_atom(obj):
     """
     Decide whether an atomic constraint is mixed (it requires multiple measurements).
     """
-    return MixedAtom in type(obj).__bases__
+    return isinstance(obj, MixedAtom)
+
+def is_atom(obj):
+    """
+    Decide whether obj is an atomic constraint, either normal or mixed.
+    """
+    return isinstance(obj, _ATOM_MARKERS)
 
 def derive_sequence_of_temporal_operators(obj) -> dict:
     """
@@ -52,7 +131,7 @@ def derive_sequence_of_temporal_operators(obj) -> dict:
     """
     # initialise map from subatom index to sequence of temporal operators
     # check whether the atomic constraint given is normal or mixed
-    if is_normal_atom(obj):
+    if obj._KIND == KIND_NORMAL_ATOM:
         # normal atomic constraint case
         return {
             0: _derive_sequence_of_temporal_operators(obj)
@@ -64,7 +143,7 @@ def derive_sequence_of_temporal_operators(obj) -> dict:
             1: _derive_sequence_of_temporal_operators(obj.get_rhs_expression())
         }
 
-def _derive_sequence_of_temporal_operators(obj) -> list:
+def _derive_sequence_of_temporal_operators(obj) -> tuple:
     """
     Traverse the structure of the given atomic constraint.  This function is called by
     derive_sequence_of_temporal_operators in order to generate either 1 or 2 sequences
@@ -72,61 +151,44 @@ def _derive_sequence_of_temporal_operators(obj) -> list:
     """
     # initialise empty sequence of temporal operators
     temporal_operator_sequence = []
+    # bind the append method once, rather than looking it up for each temporal operator
+    append_temporal_operator = temporal_operator_sequence.append
     # initialise the current object to be used during the traversal
     current_obj = obj
-    # traverse the structure of current_obj until we reach a variable
-    while type(current_obj) not in [ConcreteStateVariable, TransitionVariable]:
-        # check the type of current_obj
+    # traverse the structure of current_obj until we reach a variable,
+    # which has no entry in the table of traversal steps
+    step = _TRAVERSAL_STEPS.get(type(current_obj))
+    while step is not None:
+        get_next_obj, is_temporal_operator = step
         # we only add to the temporal operator sequence in certain cases,
         # for example when a Next... class is found
-        if type(current_obj) in [ValueInConcreteStateEqualsConstant,
-                                ValueInConcreteStateLessThanConstant,
-                                ValueInConcreteStateGreaterThanConstant,
-                                ValueLengthInConcreteStateEqualsConstant,
-                                ValueLengthInConcreteStateGreaterThanConstant,
-                                ValueLengthInConcreteStateLessThanConstant,
-                                ValueLengthInConcreteStateEqualsTransitionDuration,
-                                ValueLengthInConcreteStateGreaterThanTransitionDuration,
-                                ValueLengthInConcreteStateLessThanTransitionDuration]:
-            current_obj = current_obj.get_value_expression()
-
-        elif type(current_obj) in [DurationOfTransitionLessThanConstant,
-                                    DurationOfTransitionGreaterThanConstant]:
-            current_obj = current_obj.get_transition_duration_obj()
-        
-        elif type(current_obj) is ValueInConcreteState:
-            current_obj = current_obj.get_concrete_state_expression()
-        
-        elif type(current_obj) is ValueLengthInConcreteState:
-            current_obj = current_obj.get_value_expression()
-        
-        elif type(current_obj) is DurationOfTransition:
-            current_obj = current_obj.get_transition_expression()
-        
-        elif type(current_obj) in [ConcreteStateBeforeTransition, ConcreteStateAfterTransition]:
-            temporal_operator_sequence.append(current_obj)
-            current_obj = current_obj.get_transition_expression()
-        
-        elif type(current_obj) is NextTransitionFromConcreteState:
-            temporal_operator_sequence.append(current_obj)
-            current_obj = current_obj.get_concrete_state_expression()
-        
-        elif type(current_obj) is NextConcreteStateFromConcreteState:
-            temporal_operator_sequence.append(current_obj)
-            current_obj = current_obj.get_concrete_state_expression()
-        
-        elif type(current_obj) is NextTransitionFromTransition:
-            temporal_operator_sequence.append(current_obj)
-            current_obj = current_obj.get_transition_expression()
-        
-        elif type(current_obj) is NextConcreteStateFromTransition:
-            temporal_operator_sequence.append(current_obj)
-            current_obj = current_obj.get_transition_expression()
+        if is_temporal_operator:
+            append_temporal_operator(current_obj)
+        current_obj = get_next_obj(current_obj)
+        step = _TRAVERSAL_STEPS.get(type(current_obj))
     
     # add the variable to the end of the sequence
     temporal_operator_sequence.append(current_obj)
     
-    return temporal_operator_sequence
+    # callers only read the sequence, so it is returned as a tuple that can be shared safely
+    return tuple(temporal_operator_sequence)
+
+def _copy_connectives(obj):
+    """
+    Copy the connectives in the structure of obj, keeping references to the same atomic constraints.
+    """
+    kind = obj._KIND
+    if kind == KIND_CONJUNCTION:
+        return Conjunction.from_iterable([_copy_connectives(conjunct) for conjunct in obj._conjuncts])
+    elif kind == KIND_DISJUNCTION:
+        return Disjunction.from_iterable([_copy_connectives(disjunct) for disjunct in obj._disjuncts])
+    elif kind == KIND_NEGATION:
+        # the operand has already been checked, so bypass the check in Negation.__init__
+        negation = Negation.__new__(Negation)
+        negation.operand = _copy_connectives(obj.operand)
+        return negation
+    else:
+        return obj
 
 def get_base_variable(obj) -> list:
     """
@@ -136,25 +198,40 @@ def get_base_variable(obj) -> list:
     in the case of a mixed atom, the object given should be a part of the atomic constraint (and not the atomic constraint
     itself).
     """
-    return _derive_sequence_of_temporal_operators(obj)[-1]
+    # follow the same traversal as _derive_sequence_of_temporal_operators,
+    # without building the sequence of temporal operators
+    current_obj = obj
+    step = _TRAVERSAL_STEPS.get(type(current_obj))
+    while step is not None:
+        current_obj = step[0](current_obj)
+        step = _TRAVERSAL_STEPS.get(type(current_obj))
+    return current_obj
 
 class Constraint():
     """
     Class for representing the recursive structure of the quantifier-free part of iCFTL specifications.
     """
+    __slots__ = ('_specification_obj', '_constraint')
 
     def __init__(self, specification_obj, constraint):
         self._specification_obj = specification_obj
         self._constraint = constraint
-    
-    def __repr__(self):
-        executed_lambda = self.instantiate()
-        if ConstraintBase not in type(executed_lambda).__bases__:
+        # instantiate the constraint once now, so an incomplete constraint is reported
+        # when the specification is written rather than each time it is used
+        executed_lambda = self.get_instantiated()
+        if not isinstance(executed_lambda, ConstraintBase):
             # TODO: indicate which part of the constraint is not complete
-            logger.log.info("Constraint given in specification is not complete:")
-            logger.log.info(str(executed_lambda))
+            logger.log.info("Constraint given in specification is not complete: %s", executed_lambda)
             raise Exception("Constraint given in specification is not complete.")
-        return str(executed_lambda)
+    
+    def __repr__(self):
+        # the string depends on the variables in the specification, so it is stored
+        # in the specification's cache, which is reset whenever the specification changes
+        cache = self._specification_obj._cache
+        key = (self, "__repr__")
+        if key not in cache:
+            cache[key] = str(self.get_instantiated())
+        return cache[key]
     
     def instantiate(self):
         """
@@ -165,52 +242,186 @@ class Constraint():
         executed_lambda = self._constraint(**arguments)
         return executed_lambda
     
+    def get_instantiated(self):
+        """
+        Get an instantiation of the quantifier-free part of the specification that is shared
+        between callers, so the lambda is only run once until the specification changes.
+
+        The result must not be modified - formula trees, which replace parts of the structure
+        during monitoring, should call instantiate to get their own copy.
+        """
+        cache = self._specification_obj._cache
+        key = (self, "instantiate")
+        if key not in cache:
+            cache[key] = self.instantiate()
+        return cache[key]
+    
+    def copy_instantiated(self):
+        """
+        Get a copy of the shared instantiation that can be modified, without running the lambda again.
+
+        Only the connectives are copied, since they are what formula trees modify - atomic constraints
+        are never modified, so they are shared between copies.
+        """
+        return _copy_connectives(self.get_instantiated())
+    
     def get_atomic_constraints(self):
         """
         Traverse the specification in order to get a list of the atomic constraints used.
+
+        The list is computed once per specification and shared between callers, so it must not be modified.
         """
+        cache = self._specification_obj._cache
+        key = (self, "get_atomic_constraints")
+        if key in cache:
+            return cache[key]
         # initialise an empty list of all atomic constraints
         all_atomic_constraints = []
-        # initialise stack wth top-level Specification object for traversal
-        stack = [self]
+        # initialise stack wth the instantiated constraint for traversal
+        stack = [self.get_instantiated()]
+        # bind the pop method once, rather than looking it up for each element
+        pop = stack.pop
         # process the stack while it is not empty
-        while len(stack) > 0:
-            # get the top element from the stack
-            top = stack.pop()
-            # based on the type, add child elements to the stack
-            if type(top) is Constraint:
-                stack.append(top.instantiate())
-            elif type(top) is Conjunction:
-                stack += top.get_conjuncts()
-            elif type(top) is Disjunction:
-                stack += top.get_disjuncts()
-            elif type(top) is Negation:
-                stack.append(top.get_operand())
-            elif _is_constraint_base(top):
-                all_atomic_constraints.append(top)
-            
+        while stack:
+            # the top element adds its children to the stack, or itself to the list if it is atomic
+            pop()._push_children(stack, all_atomic_constraints)
+        
+        cache[key] = all_atomic_constraints
         return all_atomic_constraints
+    
+    def get_atom_indices(self) -> dict:
+        """
+        Get a map from each atomic constraint to the index at which it first occurs in the list
+        given by get_atomic_constraints.
+
+        The map is built once per specification and is shared by all formula trees, which use it
+        to find the index of an atom without searching the list of atomic constraints.
+        """
+        cache = self._specification_obj._cache
+        key = (self, "get_atom_indices")
+        if key not in cache:
+            atom_indices = {}
+            for (index, atom) in enumerate(self.get_atomic_constraints()):
+                # atoms that are equal share the index of the first occurrence, as with list.index
+                atom_indices.setdefault(atom, index)
+            cache[key] = atom_indices
+        return cache[key]
+    
+    def _get_base_variable(self, atom_index: int, subatom_index: int) -> tuple:
+        """
+        Get the pair (name, index in the sequence of quantified variables) of the base variable
+        of the subatom at subatom_index in the atomic constraint at atom_index.
+
+        The base variable depends only on the structure of the constraint, so each pair is found
+        by traversing the subatom once and is then held in a single map from (atom index, subatom index)
+        pairs that is shared by all formula trees.
+        """
+        cache = self._specification_obj._cache
+        key = (self, "_get_base_variable")
+        if key not in cache:
+            cache[key] = {}
+        base_variables = cache[key]
+        if (atom_index, subatom_index) not in base_variables:
+            expression = self.get_atomic_constraints()[atom_index].get_expression(subatom_index)
+            base_variable_name = get_base_variable(expression).get_name()
+            base_variable_index = self._specification_obj._compute_variables()[0].index(base_variable_name)
+            base_variables[(atom_index, subatom_index)] = (base_variable_name, base_variable_index)
+        return base_variables[(atom_index, subatom_index)]
+    
+    def get_base_variable_name(self, atom_index: int, subatom_index: int) -> str:
+        """
+        Get the name of the base variable of the subatom at subatom_index in the atomic constraint
+        at atom_index.
+        """
+        return self._get_base_variable(atom_index, subatom_index)[0]
+    
+    def get_base_variable_index(self, atom_index: int, subatom_index: int) -> int:
+        """
+        Get the index, in the sequence of quantified variables of the specification, of the base variable
+        of the subatom at subatom_index in the atomic constraint at atom_index.
+
+        This lets formula trees decide which measurements to carry over to an extended binding
+        without searching the list of variables.
+        """
+        return self._get_base_variable(atom_index, subatom_index)[1]
 
 class ConstraintBase():
     """
     Class for representing the root of a combination of constraints.
     """
+    __slots__ = ()
+
+    # _KIND is given by NormalAtom or MixedAtom for atomic constraints, and by each connective
 
-    pass
+    def _push_children(self, stack, atomic_constraints):
+        """
+        Given the stack used by Constraint.get_atomic_constraints, push the children of self onto it,
+        or add self to atomic_constraints if self is atomic.
+
+        Connectives override this.
+        """
+        atomic_constraints.append(self)
 
 class NormalAtom():
     """
     Class representing an atomic constraint for which a single measurement must be taken.
     """
+    __slots__ = ()
 
-    pass
+    _KIND = KIND_NORMAL_ATOM
 
 class MixedAtom():
     """
     Class representing an atomic constraint for which multiple measurements must be taken.
     """
+    __slots__ = ()
+
+    _KIND = KIND_MIXED_ATOM
+
+# marker classes for the two kinds of atomic constraint, used by is_atom
+_ATOM_MARKERS = (NormalAtom, MixedAtom)
 
-    pass
+"""
+Base class for atomic constraints comparing an expression with a constant.
+"""
+
+class ComparisonWithConstant():
+    """
+    Class holding the behaviour shared by atomic constraints that compare the measurement
+    of a single expression with a constant.
+
+    Subclasses set _FORMAT, the format string used to serialise the constraint,
+    and _COMPARE, the function used to compare a measurement with the constant.
+    """
+    __slots__ = ('_expression', '_constant', '_repr', '_hash')
+
+    def __init__(self, expression, constant):
+        self._expression = expression
+        self._constant = constant
+    
+    @_cached_repr
+    def __repr__(self):
+        return self._FORMAT.format(self._expression, self._constant)
+    
+    def __eq__(self, other):
+        return other is self or (type(other) is type(self)
+                                and self._expression == other._expression
+                                and self._constant == other._constant)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._expression, self._constant))
+    
+    def get_expression(self, index):
+        return self._expression
+    
+    def check(self, atom_index, subatom_index, measurement_dictionary):
+        """
+        Given the measurement found at measurement_dictionary[atom_index][subatom_index],
+        check to see whether the constraint expressed by this atom is satisfied.
+        """
+        measurement = measurement_dictionary[atom_index][subatom_index]
+        return self._COMPARE(measurement, self._constant)
 
 """
 Propositional connectives.
@@ -220,41 +431,97 @@ class Conjunction(ConstraintBase):
     """
     Class to represent a conjunction of 2 or more constraints.
     """
+    __slots__ = ('_conjuncts',)
+
+    _KIND = KIND_CONJUNCTION
 
     def __init__(self, *conjuncts):
-        # check that each conjunct is complete
+        # check that each conjunct is complete, only looking for the one to report if the check fails
+        if not all(map(is_complete, conjuncts)):
+            conjunct = next(conjunct for conjunct in conjuncts if not is_complete(conjunct))
+            raise Exception(f"Conjunct {conjunct} is not complete")
+        self._set_conjuncts(conjuncts)
+    
+    @classmethod
+    def from_iterable(cls, conjuncts):
+        """
+        Construct a conjunction from an iterable of conjuncts that are already known to be complete,
+        without unpacking them into arguments or checking them again.
+        """
+        conjunction = cls.__new__(cls)
+        conjunction._set_conjuncts(conjuncts)
+        return conjunction
+    
+    def _set_conjuncts(self, conjuncts):
+        # we build a list so that conjuncts can be replaced during formula tree updates
+        # conjuncts that are themselves conjunctions are flattened into this one
+        self._conjuncts = []
         for conjunct in conjuncts:
-            if not is_complete(conjunct):
-                raise Exception(f"Conjunct {conjunct} is not complete")
-        # we cast to a list so that conjuncts can be replaced during formula tree updates
-        self._conjuncts = list(conjuncts)
+            if type(conjunct) is Conjunction:
+                self._conjuncts += conjunct._conjuncts
+            else:
+                self._conjuncts.append(conjunct)
     
     def __repr__(self):
-        serialised_conjuncts = map(str, self._conjuncts)
-        return " and ".join(serialised_conjuncts)
+        # this is not cached, since formula trees replace conjuncts during monitoring
+        return " and ".join(map(str, self._conjuncts))
     
     def get_conjuncts(self) -> list:
+        """
+        Return the list of conjuncts itself (not a copy), so formula trees can replace conjuncts in place.
+        """
         return self._conjuncts
+    
+    def _push_children(self, stack, atomic_constraints):
+        stack += self._conjuncts
 
 class Disjunction(ConstraintBase):
     """
     Class to represent a disjunction of 2 or more constraints.
     """
+    __slots__ = ('_disjuncts',)
+
+    _KIND = KIND_DISJUNCTION
 
     def __init__(self, *disjuncts):
-        # check that each disjunct is complete
+        # check that each disjunct is complete, only looking for the one to report if the check fails
+        if not all(map(is_complete, disjuncts)):
+            disjunct = next(disjunct for disjunct in disjuncts if not is_complete(disjunct))
+            raise Exception(f"Disjunct {disjunct} is not complete")
+        self._set_disjuncts(disjuncts)
+    
+    @classmethod
+    def from_iterable(cls, disjuncts):
+        """
+        Construct a disjunction from an iterable of disjuncts that are already known to be complete,
+        without unpacking them into arguments or checking them again.
+        """
+        disjunction = cls.__new__(cls)
+        disjunction._set_disjuncts(disjuncts)
+        return disjunction
+    
+    def _set_disjuncts(self, disjuncts):
+        # we build a list so that disjuncts can be replaced during formula tree updates
+        # disjuncts that are themselves disjunctions are flattened into this one
+        self._disjuncts = []
         for disjunct in disjuncts:
-            if not is_complete(disjunct):
-                raise Exception(f"Disjunct {disjunct} is not complete")
-        # we cast to a list so that conjuncts can be replaced during formula tree updates
-        self._disjuncts = list(disjuncts)
+            if type(disjunct) is Disjunction:
+                self._disjuncts += disjunct._disjuncts
+            else:
+                self._disjuncts.append(disjunct)
     
     def __repr__(self):
-        serialised_disjuncts = map(str, self._disjuncts)
-        return " or ".join(serialised_disjuncts)
+        # this is not cached, since formula trees replace disjuncts during monitoring
+        return " or ".join(map(str, self._disjuncts))
     
     def get_disjuncts(self) -> list:
+        """
+        Return the list of disjuncts itself (not a copy), so formula trees can replace disjuncts in place.
+        """
         return self._disjuncts
+    
+    def _push_children(self, stack, atomic_constraints):
+        stack += self._disjuncts
 
 class Negation(ConstraintBase):
     """
@@ -262,6 +529,9 @@ class Negation(ConstraintBase):
 
     Negation should be propagated through to atomic constraints.
     """
+    __slots__ = ('operand',)
+
+    _KIND = KIND_NEGATION
 
     def __init__(self, operand):
         # check that operand is complete
@@ -274,6 +544,12 @@ class Negation(ConstraintBase):
     
     def get_operand(self):
         return self.operand
+    
+    def _push_children(self, stack, atomic_constraints):
+        stack.append(self.operand)
+
+# the connective classes, used by _is_connective
+_CONNECTIVES = frozenset({Conjunction, Disjunction, Negation})
 
 """
 Types of expressions.
@@ -283,49 +559,49 @@ class ConcreteStateExpression():
     """
     Class to represent a concrete state (whether bound to a variable or seen elsewhere).
     """
+    __slots__ = ()
 
     def next(self, predicate):
         """
         Given a predicate, instantiate an object representing either the next satisfying concrete
         state or the next satisfying transition.
         """
-        if type(predicate) is calls:
-            return NextTransitionFromConcreteState(self, predicate)
-        elif type(predicate) is changes:
-            return NextConcreteStateFromConcreteState(self, predicate)
+        next_class = self._NEXT.get(type(predicate))
+        if next_class:
+            return next_class(self, predicate)
     
     def __call__(self, program_variable_name: str):
-        return ValueInConcreteState(self, program_variable_name)
+        return _hash_cons(ValueInConcreteState, self, program_variable_name)
 
 class TransitionExpression():
     """
     Class to represent a transition (whether bound to a variable or seen elsewhere).
     """
+    __slots__ = ()
 
     def duration(self):
-        return DurationOfTransition(self)
+        return _hash_cons(DurationOfTransition, self)
     
     def next(self, predicate):
         """
         Given a predicate, instantiate an object representing either the next satisfying concrete
         state or the next satisfying transition.
         """
-        if type(predicate) is calls:
-            return NextTransitionFromTransition(self, predicate)
-        elif type(predicate) is changes:
-            return NextConcreteStateFromTransition(self, predicate)
+        next_class = self._NEXT.get(type(predicate))
+        if next_class:
+            return next_class(self, predicate)
     
     def before(self):
         """
         Instantiate a ConcreteStateBeforeTransition object.
         """
-        return ConcreteStateBeforeTransition(self)
+        return _hash_cons(ConcreteStateBeforeTransition, self)
     
     def after(self):
         """
         Instantiate a ConcreteStateBeforeTransition object.
         """
-        return ConcreteStateAfterTransition(self)
+        return _hash_cons(ConcreteStateAfterTransition, self)
 
 """
 Types of variables.
@@ -335,16 +611,21 @@ class ConcreteStateVariable(ConcreteStateExpression):
     """
     Class to represent a concrete state captured by a quantifier.
     """
+    __slots__ = ('_name', '__weakref__')
 
     def __init__(self, name):
-        self._name = name
+        # names are compared and used in strings often, so a single interned copy is kept
+        self._name = sys.intern(name)
     
     def __repr__(self):
         return self._name
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._name == other._name)
+        return other is self or (type(other) is type(self)
+                                and self._name == other._name)
+    
+    def __hash__(self):
+        return hash((type(self), self._name))
     
     def get_name(self) -> str:
         return self._name
@@ -353,16 +634,21 @@ class TransitionVariable(TransitionExpression):
     """
     Class to represent a transition captured by a quantifier.
     """
+    __slots__ = ('_name', '__weakref__')
 
     def __init__(self, name):
-        self._name = name
+        # names are compared and used in strings often, so a single interned copy is kept
+        self._name = sys.intern(name)
     
     def __repr__(self):
         return self._name
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._name == other._name)
+        return other is self or (type(other) is type(self)
+                                and self._name == other._name)
+    
+    def __hash__(self):
+        return hash((type(self), self._name))
     
     def get_name(self) -> str:
         return self._name
@@ -375,18 +661,25 @@ class ValueInConcreteState():
     """
     Class to represent the value given to a variable by a concrete state.
     """
+    __slots__ = ('_concrete_state_expression', '_program_variable_name', '_repr', '_hash', '__weakref__')
 
     def __init__(self, concrete_state_expression, program_variable_name):
         self._concrete_state_expression = concrete_state_expression
         self._program_variable_name = program_variable_name
+        # instances are shared and never modified, so the string is built once here
+        self._repr = str(concrete_state_expression) + "(" + str(program_variable_name) + ")"
     
     def __repr__(self):
-        return f"{self._concrete_state_expression}({self._program_variable_name})"
+        return self._repr
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._concrete_state_expression == other._concrete_state_expression
-                and self._program_variable_name == other._program_variable_name)
+        return other is self or (type(other) is type(self)
+                                and self._concrete_state_expression == other._concrete_state_expression
+                                and self._program_variable_name == other._program_variable_name)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._concrete_state_expression, self._program_variable_name))
     
     def get_concrete_state_expression(self):
         return self._concrete_state_expression
@@ -398,15 +691,15 @@ class ValueInConcreteState():
         return ValueLengthInConcreteState(self)
     
     def __lt__(self, other):
-        if type(other) in [int, str, float]:
+        if type(other) in _SCALAR:
             return ValueInConcreteStateLessThanConstant(self, other)
     
     def __gt__(self, other):
-        if type(other) in [int, str, float]:
+        if type(other) in _SCALAR:
             return ValueInConcreteStateGreaterThanConstant(self, other)
     
     def equals(self, other):
-        if type(other) in [int, str, float, bool]:
+        if type(other) in _SCALAR_BOOL:
             return ValueInConcreteStateEqualsConstant(self, other)
 
 class ValueLengthInConcreteState(ConstraintBase, NormalAtom):
@@ -414,33 +707,40 @@ class ValueLengthInConcreteState(ConstraintBase, NormalAtom):
     Class to represent the atomic constraint q(x).length() == n for a concrete state variable q, a program variable
     x and a (numerical) constant n.
     """
+    __slots__ = ('_value_expression', '_repr', '_hash')
+
     def __init__(self, value_expression):
         self._value_expression = value_expression
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._value_expression}.length()"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression)
+        return other is self or (type(other) is type(self)
+                                and self._value_expression == other._value_expression)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._value_expression))
     
     def get_value_expression(self):
         return self._value_expression
     
     def __lt__(self, other):
-        if type(other) in [int, float]:
+        if type(other) in _NUMERIC:
             return ValueLengthInConcreteStateLessThanConstant(self, other)
         elif type(other) is DurationOfTransition:
             return ValueLengthInConcreteStateLessThanTransitionDuration(self, other)
     
     def __gt__(self, other):
-        if type(other) in [int, float]:
+        if type(other) in _NUMERIC:
             return ValueLengthInConcreteStateGreaterThanConstant(self, other)
         elif type(other) is DurationOfTransition:
             return ValueLengthInConcreteStateGreaterThanTransitionDuration(self, other)
     
     def equals(self, other):
-        if type(other) in [int, float]:
+        if type(other) in _NUMERIC:
             return ValueLengthInConcreteStateEqualsConstant(self, other)
         elif type(other) is DurationOfTransition:
             return ValueLengthInConcreteStateEqualsTransitionDuration(self, other)
@@ -449,119 +749,68 @@ class ValueLengthInConcreteState(ConstraintBase, NormalAtom):
 Atomic constraints for concrete states.
 """
 
-class ValueLengthInConcreteStateLessThanConstant(ConstraintBase, NormalAtom):
+class ValueLengthInConcreteStateLessThanConstant(ComparisonWithConstant, ConstraintBase, NormalAtom):
     """
     Class to represent the atomic constraint q(x).length() < n for a concrete state variable q, a program variable x
     and a constant n.
     """
+    __slots__ = ()
 
-    def __init__(self, value_expression, constant):
-        self._value_expression = value_expression
-        self._constant = constant
-    
-    def __repr__(self):
-        return f"{self._value_expression} < {self._constant}"
-    
-    def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression
-                and self._constant == other._constant)
+    _FORMAT = "{} < {}"
+    _COMPARE = staticmethod(operator.lt)
     
     def get_value_expression(self):
-        return self._value_expression
-    
-    def get_expression(self, index):
-        return self.get_value_expression()
-    
-    def check(self, atom_index, subatom_index, measurement_dictionary):
-        """
-        Given the measurement found at measurement_dictionary[atom_index][subatom_index],
-        check to see whether the constraint expressed by this atom is satisfied.
-        """
-        measurement = measurement_dictionary[atom_index][subatom_index]
-        return measurement < self._constant
+        return self._expression
 
-class ValueLengthInConcreteStateGreaterThanConstant(ConstraintBase, NormalAtom):
+class ValueLengthInConcreteStateGreaterThanConstant(ComparisonWithConstant, ConstraintBase, NormalAtom):
     """
     Class to represent the atomic constraint q(x).length() > n for a concrete state variable q, a program variable x
     and a constant n.
     """
+    __slots__ = ()
 
-    def __init__(self, value_expression, constant):
-        self._value_expression = value_expression
-        self._constant = constant
-    
-    def __repr__(self):
-        return f"{self._value_expression} > {self._constant}"
-    
-    def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression
-                and self._constant == other._constant)
+    _FORMAT = "{} > {}"
+    _COMPARE = staticmethod(operator.gt)
     
     def get_value_expression(self):
-        return self._value_expression
-    
-    def get_expression(self, index):
-        return self.get_value_expression()
-    
-    def check(self, atom_index, subatom_index, measurement_dictionary):
-        """
-        Given the measurement found at measurement_dictionary[atom_index][subatom_index],
-        check to see whether the constraint expressed by this atom is satisfied.
-        """
-        measurement = measurement_dictionary[atom_index][subatom_index]
-        return measurement > self._constant
+        return self._expression
 
-class ValueLengthInConcreteStateEqualsConstant(ConstraintBase, NormalAtom):
+class ValueLengthInConcreteStateEqualsConstant(ComparisonWithConstant, ConstraintBase, NormalAtom):
     """
     Class to represent the atomic constraint q(x).length().equals(n) for a concrete state variable q, a program variable x
     and a constant n.
     """
+    __slots__ = ()
 
-    def __init__(self, value_expression, constant):
-        self._value_expression = value_expression
-        self._constant = constant
-    
-    def __repr__(self):
-        return f"{self._value_expression}.equals({self._constant})"
-    
-    def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression
-                and self._constant == other._constant)
+    _FORMAT = "{}.equals({})"
+    _COMPARE = staticmethod(operator.eq)
     
     def get_value_expression(self):
-        return self._value_expression
-    
-    def get_expression(self, index):
-        return self.get_value_expression()
-    
-    def check(self, atom_index, subatom_index, measurement_dictionary):
-        """
-        Given the measurement found at measurement_dictionary[atom_index][subatom_index],
-        check to see whether the constraint expressed by this atom is satisfied.
-        """
-        measurement = measurement_dictionary[atom_index][subatom_index]
-        return measurement == self._constant
+        return self._expression
 
 class ValueLengthInConcreteStateLessThanTransitionDuration(ConstraintBase, MixedAtom):
     """
     Class to represent the atomic constraint q(x).length() < t.duration() for a concrete state variable q, a program variable x
     and a transition duration t.duration().
     """
+    __slots__ = ('_value_expression', '_duration', '_repr', '_hash')
 
     def __init__(self, value_expression, duration):
         self._value_expression = value_expression
         self._duration = duration
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._value_expression} < {self._duration}"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression
-                and self._duration == other._duration)
+        return other is self or (type(other) is type(self)
+                                and self._value_expression == other._value_expression
+                                and self._duration == other._duration)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._value_expression, self._duration))
     
     def get_value_expression(self):
         return self._value_expression
@@ -582,10 +831,12 @@ class ValueLengthInConcreteStateLessThanTransitionDuration(ConstraintBase, Mixed
         Given the measurement found at measurement_dictionary[atom_index][subatom_index],
         check to see whether the constraint expressed by this atom is satisfied.
         """
+        # look up the measurements for this atom once
+        measurements = measurement_dictionary[atom_index]
         # first, check to see if both timestamps for the two subatoms have now been recorded
-        if measurement_dictionary[atom_index].get(0) and measurement_dictionary[atom_index].get(1):
+        if measurements.get(0) and measurements.get(1):
             # the measurements exist, so compare them
-            return measurement_dictionary[atom_index][0] < measurement_dictionary[atom_index][1]
+            return measurements[0] < measurements[1]
         else:
             # otherwise, return the atom (this will be returned to the previous level of the formula tree)
             return self
@@ -595,18 +846,24 @@ class ValueLengthInConcreteStateGreaterThanTransitionDuration(ConstraintBase, Mi
     Class to represent the atomic constraint q(x).length() > t.duration() for a concrete state variable q, a program variable x
     and a transition duration t.duration().
     """
+    __slots__ = ('_value_expression', '_duration', '_repr', '_hash')
 
     def __init__(self, value_expression, duration):
         self._value_expression = value_expression
         self._duration = duration
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._value_expression} > {self._duration}"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression
-                and self._duration == other._duration)
+        return other is self or (type(other) is type(self)
+                                and self._value_expression == other._value_expression
+                                and self._duration == other._duration)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._value_expression, self._duration))
     
     def get_value_expression(self):
         return self._value_expression
@@ -627,10 +884,12 @@ class ValueLengthInConcreteStateGreaterThanTransitionDuration(ConstraintBase, Mi
         Given the measurement found at measurement_dictionary[atom_index][subatom_index],
         check to see whether the constraint expressed by this atom is satisfied.
         """
+        # look up the measurements for this atom once
+        measurements = measurement_dictionary[atom_index]
         # first, check to see if both timestamps for the two subatoms have now been recorded
-        if measurement_dictionary[atom_index].get(0) and measurement_dictionary[atom_index].get(1):
+        if measurements.get(0) and measurements.get(1):
             # the measurements exist, so compare them
-            return measurement_dictionary[atom_index][0] > measurement_dictionary[atom_index][1]
+            return measurements[0] > measurements[1]
         else:
             # otherwise, return the atom (this will be returned to the previous level of the formula tree)
             return self
@@ -640,18 +899,24 @@ class ValueLengthInConcreteStateEqualsTransitionDuration(ConstraintBase, MixedAt
     Class to represent the atomic constraint q(x).length().equals(t.duration()) for a concrete state variable q, a program variable x
     and a transition duration t.duration().
     """
+    __slots__ = ('_value_expression', '_duration', '_repr', '_hash')
 
     def __init__(self, value_expression, duration):
         self._value_expression = value_expression
         self._duration = duration
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._value_expression}.equals({self._duration})"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression
-                and self._duration == other._duration)
+        return other is self or (type(other) is type(self)
+                                and self._value_expression == other._value_expression
+                                and self._duration == other._duration)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._value_expression, self._duration))
     
     def get_value_expression(self):
         return self._value_expression
@@ -672,102 +937,54 @@ class ValueLengthInConcreteStateEqualsTransitionDuration(ConstraintBase, MixedAt
         Given the measurement found at measurement_dictionary[atom_index][subatom_index],
         check to see whether the constraint expressed by this atom is satisfied.
         """
+        # look up the measurements for this atom once
+        measurements = measurement_dictionary[atom_index]
         # first, check to see if both timestamps for the two subatoms have now been recorded
-        if measurement_dictionary[atom_index].get(0) and measurement_dictionary[atom_index].get(1):
+        if measurements.get(0) and measurements.get(1):
             # the measurements exist, so compare them
-            return measurement_dictionary[atom_index][0] == measurement_dictionary[atom_index][1]
+            return measurements[0] == measurements[1]
         else:
             # otherwise, return the atom (this will be returned to the previous level of the formula tree)
             return self
 
-class ValueInConcreteStateEqualsConstant(ConstraintBase, NormalAtom):
+class ValueInConcreteStateEqualsConstant(ComparisonWithConstant, ConstraintBase, NormalAtom):
     """
     Class to represent the atomic constraint q(x) == n for a concrete state variable q, a program variable x
     and a constant n.
     """
+    __slots__ = ()
 
-    def __init__(self, value_expression, constant):
-        self._value_expression = value_expression
-        self._constant = constant
-    
-    def __repr__(self):
-        return f"{self._value_expression}.equals({self._constant})"
-    
-    def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression
-                and self._constant == other._constant)
+    _FORMAT = "{}.equals({})"
+    _COMPARE = staticmethod(operator.eq)
     
     def get_value_expression(self):
-        return self._value_expression
-    
-    def get_expression(self, index):
-        return self.get_value_expression()
-    
-    def check(self, atom_index, subatom_index, measurement_dictionary):
-        """
-        Given the measurement found at measurement_dictionary[atom_index][subatom_index],
-        check to see whether the constraint expressed by this atom is satisfied.
-        """
-        measurement = measurement_dictionary[atom_index][subatom_index]
-        return measurement == self._constant
+        return self._expression
 
-
-class ValueInConcreteStateLessThanConstant(ConstraintBase, NormalAtom):
+class ValueInConcreteStateLessThanConstant(ComparisonWithConstant, ConstraintBase, NormalAtom):
     """
     Class to represent the atomic constraint q(x) < n for a concrete state variable q, a program variable x
     and a constant n.
     """
+    __slots__ = ()
 
-    def __init__(self, value_expression, constant):
-        self._value_expression = value_expression
-        self._constant = constant
-    
-    def __repr__(self):
-        return f"{self._value_expression} < {self._constant}"
-    
-    def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression
-                and self._constant == other._constant)
+    _FORMAT = "{} < {}"
+    _COMPARE = staticmethod(operator.lt)
     
     def get_value_expression(self):
-        return self._value_expression
-    
-    def get_expression(self, index):
-        return self.get_value_expression()
-    
-    def check(self, atom_index, subatom_index, measurement_dictionary):
-        """
-        Given the measurement found at measurement_dictionary[atom_index][subatom_index],
-        check to see whether the constraint expressed by this atom is satisfied.
-        """
-        measurement = measurement_dictionary[atom_index][subatom_index]
-        return measurement < self._constant
+        return self._expression
 
-class ValueInConcreteStateGreaterThanConstant(ConstraintBase, NormalAtom):
+class ValueInConcreteStateGreaterThanConstant(ComparisonWithConstant, ConstraintBase, NormalAtom):
     """
     Class to represent the atomic constraint q(x) > n for a concrete state variable q, a program variable x
     and a constant n.
     """
+    __slots__ = ()
 
-    def __init__(self, value_expression, constant):
-        self._value_expression = value_expression
-        self._constant = constant
-    
-    def __repr__(self):
-        return f"{self._value_expression} > {self._constant}"
-    
-    def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._value_expression == other._value_expression
-                and self._constant == other._constant)
+    _FORMAT = "{} > {}"
+    _COMPARE = staticmethod(operator.gt)
     
     def get_value_expression(self):
-        return self._value_expression
-    
-    def get_expression(self, index):
-        return self.get_value_expression()
+        return self._expression
 
 """
 Attributes of transitions.
@@ -777,42 +994,58 @@ class DurationOfTransition():
     """
     Class to represent the result of calling .duration() on a transition.
     """
+    __slots__ = ('_transition_expression', '_repr', '_hash', '__weakref__')
 
     def __init__(self, transition_expression):
         self._transition_expression = transition_expression
+        # instances are shared and never modified, so the string is built once here
+        self._repr = str(transition_expression) + ".duration()"
     
     def __repr__(self):
-        return f"{self._transition_expression}.duration()"
+        return self._repr
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._transition_expression == other._transition_expression)
+        return other is self or (type(other) is type(self)
+                                and self._transition_expression == other._transition_expression)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._transition_expression))
     
     def get_transition_expression(self):
         return self._transition_expression
     
     def __lt__(self, other):
-        if type(other) in [int, float]:
+        if type(other) in _NUMERIC:
             return DurationOfTransitionLessThanConstant(self, other)
-        if type(other) in [int, float]:
-            return DurationOfTransitionGreaterThanConstant(self, other)
         if type(other) is ValueInConcreteState:
             return DurationOfTransitionLessThanValueInConcreteState(self, other)
+    
+    def __gt__(self, other):
+        if type(other) in _NUMERIC:
+            return DurationOfTransitionGreaterThanConstant(self, other)
 
 class ConcreteStateBeforeTransition(ConcreteStateExpression):
     """
     Class to represent the first concrete state in a transition.
     """
+    __slots__ = ('_transition_expression', '_repr', '_hash', '__weakref__')
 
     def __init__(self, transition_expression):
         self._transition_expression = transition_expression
+        # instances are shared and never modified, so the string is built once here
+        self._repr = str(transition_expression) + ".before()"
     
     def __repr__(self):
-        return f"{self._transition_expression}.before()"
+        return self._repr
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._transition_expression == other._transition_expression)
+        return other is self or (type(other) is type(self)
+                                and self._transition_expression == other._transition_expression)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._transition_expression))
     
     def get_transition_expression(self):
         return self._transition_expression
@@ -821,16 +1054,23 @@ class ConcreteStateAfterTransition(ConcreteStateExpression):
     """
     Class to represent the second concrete state in a transition.
     """
+    __slots__ = ('_transition_expression', '_repr', '_hash', '__weakref__')
 
     def __init__(self, transition_expression):
         self._transition_expression = transition_expression
+        # instances are shared and never modified, so the string is built once here
+        self._repr = str(transition_expression) + ".after()"
     
     def __repr__(self):
-        return f"{self._transition_expression}.after()"
+        return self._repr
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._transition_expression == other._transition_expression)
+        return other is self or (type(other) is type(self)
+                                and self._transition_expression == other._transition_expression)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._transition_expression))
     
     def get_transition_expression(self):
         return self._transition_expression
@@ -839,54 +1079,41 @@ class ConcreteStateAfterTransition(ConcreteStateExpression):
 Atomic constraints over transitions.
 """
 
-class DurationOfTransitionLessThanConstant(ConstraintBase, NormalAtom):
+class DurationOfTransitionLessThanConstant(ComparisonWithConstant, ConstraintBase, NormalAtom):
     """
     Class to represent the comparison of a transition duration with a constant.
     """
+    __slots__ = ()
 
-    def __init__(self, transition_duration, constant):
-        self._transition_duration = transition_duration
-        self._constant = constant
-    
-    def __repr__(self):
-        return f"{self._transition_duration} < {self._constant}"
-    
-    def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._transition_duration == other._transition_duration
-                and self._constant == other._constant)
+    _FORMAT = "{} < {}"
+    _COMPARE = staticmethod(operator.lt)
     
     def get_transition_duration_obj(self):
-        return self._transition_duration
-    
-    def get_expression(self, index):
-        return self.get_transition_duration_obj()
-    
-    def check(self, atom_index, subatom_index, measurement_dictionary):
-        """
-        Given the measurement found at measurement_dictionary[atom_index][subatom_index],
-        check to see whether the constraint expressed by this atom is satisfied.
-        """
-        measurement = measurement_dictionary[atom_index][subatom_index]
-        return measurement < self._constant
+        return self._expression
 
 class DurationOfTransitionLessThanValueInConcreteState(ConstraintBase, MixedAtom):
     """
     Class to represent the comparison of a transition duration with a value
     given to a program variable by a concrete state.
     """
+    __slots__ = ('_transition_duration', '_value_expression', '_repr', '_hash')
 
     def __init__(self, transition_duration, value_expression):
         self._transition_duration = transition_duration
         self._value_expression = value_expression
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._transition_duration} < {self._value_expression}"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._transition_duration == other._transition_duration
-                and self._value_expression == other._value_expression)
+        return other is self or (type(other) is type(self)
+                                and self._transition_duration == other._transition_duration
+                                and self._value_expression == other._value_expression)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._transition_duration, self._value_expression))
     
     def get_transition_duration(self):
         return self._transition_duration
@@ -899,35 +1126,26 @@ class DurationOfTransitionLessThanValueInConcreteState(ConstraintBase, MixedAtom
         Given the measurement found at measurement_dictionary[atom_index][subatom_index],
         check to see whether the constraint expressed by this atom is satisfied.
         """
-        if measurement_dictionary[atom_index].get(0) and measurement_dictionary[atom_index].get(1):
+        # look up the measurements for this atom once
+        measurements = measurement_dictionary[atom_index]
+        if measurements.get(0) and measurements.get(1):
             # both values exist, so compare them
-            return measurement_dictionary[atom_index][0] < measurement_dictionary[atom_index][1]
+            return measurements[0] < measurements[1]
         else:
             # None is interpreted as inconclusive
             return None
 
-class DurationOfTransitionGreaterThanConstant(ConstraintBase, NormalAtom):
+class DurationOfTransitionGreaterThanConstant(ComparisonWithConstant, ConstraintBase, NormalAtom):
     """
     Class to represent the comparison of a transition duration with a constant.
     """
+    __slots__ = ()
 
-    def __init__(self, transition_duration, constant):
-        self._transition_duration = transition_duration
-        self._constant = constant
-    
-    def __repr__(self):
-        return f"{self._transition_duration} > {self._constant}"
-    
-    def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._transition_duration == other._transition_duration
-                and self._constant == other._constant)
+    _FORMAT = "{} > {}"
+    _COMPARE = staticmethod(operator.gt)
     
     def get_transition_duration_obj(self):
-        return self._transition_duration
-    
-    def get_expression(self, index):
-        return self.get_transition_duration_obj()
+        return self._expression
 
 """
 Temporal operators.
@@ -938,18 +1156,24 @@ class NextTransitionFromConcreteState(TransitionExpression):
     Class to represent the atomic constraint X.next(P) for a concrete state expression X and a predicate P
     identifying transitions.
     """
+    __slots__ = ('_concrete_state_expression', '_predicate', '_repr', '_hash')
 
     def __init__(self, concrete_state_expression, predicate):
         self._concrete_state_expression = concrete_state_expression
         self._predicate = predicate
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._concrete_state_expression}.next({self._predicate})"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._concrete_state_expression == other._concrete_state_expression
-                and self._predicate == other._predicate)
+        return other is self or (type(other) is type(self)
+                                and self._concrete_state_expression == other._concrete_state_expression
+                                and self._predicate == other._predicate)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._concrete_state_expression, self._predicate))
     
     def get_concrete_state_expression(self):
         return self._concrete_state_expression
@@ -963,18 +1187,24 @@ class NextConcreteStateFromConcreteState(ConcreteStateExpression):
     Class to represent the atomic constraint X.next(P) for a concrete state expression X and a predicate P
     identifying concrete states.
     """
+    __slots__ = ('_concrete_state_expression', '_predicate', '_repr', '_hash')
 
     def __init__(self, concrete_state_expression, predicate):
         self._concrete_state_expression = concrete_state_expression
         self._predicate = predicate
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._concrete_state_expression}.next({self._predicate})"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._concrete_state_expression == other._concrete_state_expression
-                and self._predicate == other._predicate)
+        return other is self or (type(other) is type(self)
+                                and self._concrete_state_expression == other._concrete_state_expression
+                                and self._predicate == other._predicate)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._concrete_state_expression, self._predicate))
     
     def get_concrete_state_expression(self):
         return self._concrete_state_expression
@@ -987,18 +1217,24 @@ class NextTransitionFromTransition(TransitionExpression):
     Class to represent the atomic constraint X.next(P) for a concrete state expression X and a predicate P
     identifying transitions.
     """
+    __slots__ = ('_transition_expression', '_predicate', '_repr', '_hash')
 
     def __init__(self, transition_expression, predicate):
         self._transition_expression = transition_expression
         self._predicate = predicate
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._transition_expression}.next({self._predicate})"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._transition_expression == other._transition_expression
-                and self._predicate == other._predicate)
+        return other is self or (type(other) is type(self)
+                                and self._transition_expression == other._transition_expression
+                                and self._predicate == other._predicate)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._transition_expression, self._predicate))
     
     def get_transition_expression(self):
         return self._transition_expression
@@ -1012,18 +1248,24 @@ class NextConcreteStateFromTransition(ConcreteStateExpression):
     Class to represent the atomic constraint X.next(P) for a concrete state expression X and a predicate P
     identifying concrete states.
     """
+    __slots__ = ('_transition_expression', '_predicate', '_repr', '_hash')
 
     def __init__(self, transition_expression, predicate):
         self._transition_expression = transition_expression
         self._predicate = predicate
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._transition_expression}.next({self._predicate})"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._transition_expression == other._transition_expression
-                and self._predicate == other._predicate)
+        return other is self or (type(other) is type(self)
+                                and self._transition_expression == other._transition_expression
+                                and self._predicate == other._predicate)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._transition_expression, self._predicate))
     
     def get_transition_expression(self):
         return self._transition_expression
@@ -1031,6 +1273,17 @@ class NextConcreteStateFromTransition(ConcreteStateExpression):
     def get_predicate(self):
         return self._predicate
 
+# map from predicate type to the class that next(predicate) instantiates,
+# for concrete state and transition expressions respectively
+ConcreteStateExpression._NEXT = {
+    calls: NextTransitionFromConcreteState,
+    changes: NextConcreteStateFromConcreteState
+}
+TransitionExpression._NEXT = {
+    calls: NextTransitionFromTransition,
+    changes: NextConcreteStateFromTransition
+}
+
 """
 Measurement operators.
 """
@@ -1039,24 +1292,30 @@ class TimeBetween():
     """
     Class to represent the timeBetween operator.
     """
+    __slots__ = ('_concrete_state_expression_1', '_concrete_state_expression_2', '_repr', '_hash')
 
     def __init__(self, concrete_state_expression_1, concrete_state_expression_2):
-        if (ConcreteStateExpression not in type(concrete_state_expression_1).__bases__
-            or ConcreteStateExpression not in type(concrete_state_expression_2).__bases__):
+        if (not isinstance(concrete_state_expression_1, ConcreteStateExpression)
+            or not isinstance(concrete_state_expression_2, ConcreteStateExpression)):
             raise Exception("timeBetween arguments must be states.")
         self._concrete_state_expression_1 = concrete_state_expression_1
         self._concrete_state_expression_2 = concrete_state_expression_2
     
+    @_cached_repr
     def __repr__(self):
         return f"timeBetween({self._concrete_state_expression_1}, {self._concrete_state_expression_2})"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._concrete_state_expression_1 == other._concrete_state_expression_1
-                and self._concrete_state_expression_2 == other._concrete_state_expression_2)
+        return other is self or (type(other) is type(self)
+                                and self._concrete_state_expression_1 == other._concrete_state_expression_1
+                                and self._concrete_state_expression_2 == other._concrete_state_expression_2)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._concrete_state_expression_1, self._concrete_state_expression_2))
     
     def __lt__(self, other):
-        if type(other) in [int, float]:
+        if type(other) in _NUMERIC:
             return TimeBetweenLessThanConstant(self, other)
     
     def get_lhs_expression(self):
@@ -1069,6 +1328,7 @@ class TimeBetweenLessThanConstant(ConstraintBase, MixedAtom):
     """
     Class to represent the atomic constraint timeBetween(q, q') < n for some numerical constant n.
     """
+    __slots__ = ('_time_between_expression', '_constant', '_observed_lhs_value', '_observed_rhs_value', '_repr', '_hash')
 
     def __init__(self, time_between_expression, constant):
         self._time_between_expression = time_between_expression
@@ -1076,13 +1336,18 @@ class TimeBetweenLessThanConstant(ConstraintBase, MixedAtom):
         self._observed_lhs_value = None
         self._observed_rhs_value = None
     
+    @_cached_repr
     def __repr__(self):
         return f"{self._time_between_expression} < {self._constant}"
     
     def __eq__(self, other):
-        return (type(other) is type(self)
-                and self._time_between_expression == other._time_between_expression
-                and self._constant == other._constant)
+        return other is self or (type(other) is type(self)
+                                and self._time_between_expression == other._time_between_expression
+                                and self._constant == other._constant)
+    
+    @_cached_hash
+    def __hash__(self):
+        return hash((type(self), self._time_between_expression, self._constant))
     
     def get_time_between_expression(self):
         return self._time_between_expression
@@ -1105,10 +1370,38 @@ class TimeBetweenLessThanConstant(ConstraintBase, MixedAtom):
         Given the measurement found at measurement_dictionary[atom_index][subatom_index],
         check to see whether the constraint expressed by this atom is satisfied.
         """
+        # look up the measurements for this atom once
+        measurements = measurement_dictionary[atom_index]
         # first, check to see if both timestamps for the two subatoms have now been recorded
-        if measurement_dictionary[atom_index].get(0) and measurement_dictionary[atom_index].get(1):
+        if measurements.get(0) and measurements.get(1):
             # the timestamps exist, so take their difference and compare it with self._constant
-            return abs(measurement_dictionary[atom_index][1] - measurement_dictionary[atom_index][0]) < self._constant
+            return abs(measurements[1] - measurements[0]) < self._constant
         else:
             # otherwise, return the atom (this will be returned to the previous level of the formula tree)
             return self
+
+# map from each class that can occur inside an atomic constraint to the method giving the next object
+# in the traversal performed by _derive_sequence_of_temporal_operators, and whether instances are
+# temporal operators that should be added to the sequence
+_TRAVERSAL_STEPS = {
+    ValueInConcreteStateEqualsConstant: (ValueInConcreteStateEqualsConstant.get_value_expression, False),
+    ValueInConcreteStateLessThanConstant: (ValueInConcreteStateLessThanConstant.get_value_expression, False),
+    ValueInConcreteStateGreaterThanConstant: (ValueInConcreteStateGreaterThanConstant.get_value_expression, False),
+    ValueLengthInConcreteStateEqualsConstant: (ValueLengthInConcreteStateEqualsConstant.get_value_expression, False),
+    ValueLengthInConcreteStateGreaterThanConstant: (ValueLengthInConcreteStateGreaterThanConstant.get_value_expression, False),
+    ValueLengthInConcreteStateLessThanConstant: (ValueLengthInConcreteStateLessThanConstant.get_value_expression, False),
+    ValueLengthInConcreteStateEqualsTransitionDuration: (ValueLengthInConcreteStateEqualsTransitionDuration.get_value_expression, False),
+    ValueLengthInConcreteStateGreaterThanTransitionDuration: (ValueLengthInConcreteStateGreaterThanTransitionDuration.get_value_expression, False),
+    ValueLengthInConcreteStateLessThanTransitionDuration: (ValueLengthInConcreteStateLessThanTransitionDuration.get_value_expression, False),
+    DurationOfTransitionLessThanConstant: (DurationOfTransitionLessThanConstant.get_transition_duration_obj, False),
+    DurationOfTransitionGreaterThanConstant: (DurationOfTransitionGreaterThanConstant.get_transition_duration_obj, False),
+    ValueInConcreteState: (ValueInConcreteState.get_concrete_state_expression, False),
+    ValueLengthInConcreteState: (ValueLengthInConcreteState.get_value_expression, False),
+    DurationOfTransition: (DurationOfTransition.get_transition_expression, False),
+    ConcreteStateBeforeTransition: (ConcreteStateBeforeTransition.get_transition_expression, True),
+    ConcreteStateAfterTransition: (ConcreteStateAfterTransition.get_transition_expression, True),
+    NextTransitionFromConcreteState: (NextTransitionFromConcreteState.get_concrete_state_expression, True),
+    NextConcreteStateFromConcreteState: (NextConcreteStateFromConcreteState.get_concrete_state_expression, True),
+    NextTransitionFromTransition: (NextTransitionFromTransition.get_transition_expression, True),
+    NextConcreteStateFromTransition: (NextConcreteStateFromTransition.get_transition_expression, True)
+}
@@ -7,12 +7,13 @@ Module containing classes that model iCFTL predicates.
 """
 
 class predicate():
-    pass
+    __slots__ = ()
 
 class changes(predicate):
     """
     Class for representing the syntax changes(x).during(func)
     """
+    __slots__ = ('_program_variable', '_during_function')
 
     def __init__(self, program_variable):
         self._program_variable = program_variable
@@ -26,6 +27,11 @@ class changes(predicate):
                 and self._program_variable == other._program_variable
                 and self._during_function == other._during_function)
     
+    def __hash__(self):
+        # _during_function is set by during after construction, so it is not hashed
+        # (predicates equal under __eq__ still have equal hashes)
+        return hash((type(self), self._program_variable))
+    
     def during(self, function_name):
         self._during_function = function_name
         return self
@@ -40,6 +46,7 @@ class calls(predicate):
     """
     Class for representing the syntax calls(f).during(func)
     """
+    __slots__ = ('_function_name', '_during_function')
 
     def __init__(self, function_name):
         self._function_name = function_name
@@ -53,6 +60,11 @@ class calls(predicate):
                 and self._function_name == other._function_name
                 and self._during_function == other._during_function)
     
+    def __hash__(self):
+        # _during_function is set by during after construction, so it is not hashed
+        # (predicates equal under __eq__ still have equal hashes)
+        return hash((type(self), self._function_name))
+    
     def during(self, function_name):
         self._during_function = function_name
         return self
@@ -67,6 +79,7 @@ class future(predicate):
     """
     Class for representing the future predicate for use in quantifiers (which is based on either changes or calls).
     """
+    __slots__ = ('_predicate',)
 
     def __init__(self, predicate):
         self._predicate = predicate
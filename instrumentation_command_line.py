@@ -19,19 +19,21 @@ from VyPR.Instrumentation.analyse import Analyser
 from VyPR.Instrumentation.prepare import prepare_specification
 from VyPR.Instrumentation.instrument import Instrument
 
-# initialise logging
 import VyPR.Logging.logger as logger
-logger.initialise_logging(directory="logs/instrumentation/")
 
 # define command line arguments
 parser = argparse.ArgumentParser(description="Command line interface for the instrumentation package.")
 parser.add_argument("--root-dir", type=str, required=True, help="The directory containing the code for which we will generate SCFGs.")
 parser.add_argument("--spec-file", type=str, required=True, help="The file containing the code for the specification that we should instrument for.")
 parser.add_argument("--flask", action='store_true', help="If given, the instruments placed will use g.vypr.  If not, the instruments placed will use vypr.")
+parser.add_argument("--log-level", type=str, choices=list(logger.LEVELS), default="info", help="The least severe level of message written to the log.  Messages below this level are not formatted at all.")
 
 # parse the arguments
 args = parser.parse_args()
 
+# initialise logging
+logger.initialise_logging(directory="logs/instrumentation/", level=args.log_level)
+
 # initialise Instrument object
 instrument_instance = Instrument(args.spec_file, args.root_dir, args.flask)
 
@@ -0,0 +1,4 @@
+"""
+Copyright (C) 2021 University of Luxembourg
+Developed by Dr. Joshua Heneage Dawes.
+"""
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+
+Copyright (C) 2021 University of Luxembourg
+Developed by Dr. Joshua Heneage Dawes.
+
+Module containing testing code for VyPR.Monitoring.formula_trees module.
+"""
+
+import unittest
+
+from VyPR.Specifications.builder import Specification, all_are_true, one_is_true
+from VyPR.Specifications.predicates import changes
+from VyPR.Monitoring.formula_trees import FormulaTree
+
+class TestMonitoringFormulaTrees(unittest.TestCase):
+
+    def setUp(self):
+        # construct a specification whose constraint is a disjunction and one whose constraint is a conjunction
+        self.disjunction_specification = Specification()\
+            .forall(q = changes('x').during('function'))\
+            .check(lambda q : one_is_true(q('x') < 3, q('y') < 3))
+        self.conjunction_specification = Specification()\
+            .forall(q = changes('x').during('function'))\
+            .check(lambda q : all_are_true(q('x') < 3, q('y') < 3))
+    
+    def test_formula_trees_update_independently(self):
+        # two formula trees built from one constraint share atoms, but not the connectives that are updated
+        constraint = self.conjunction_specification.get_constraint()
+        first_formula_tree = FormulaTree([0], constraint, ['q'])
+        second_formula_tree = FormulaTree([0], constraint, ['q'])
+        first_formula_tree.update_with_measurement(1, 0, 0)
+        self.assertIs(first_formula_tree.update_with_measurement(1, 1, 0), True)
+        # the second formula tree is unchanged
+        self.assertEqual(str(second_formula_tree.get_configuration()), str(constraint))
+        # and can still reach a different verdict
+        self.assertIs(second_formula_tree.update_with_measurement(5, 0, 0), False)
+    
+    def test_repeated_atom(self):
+        # q('x') < 3 occurs twice, so both occurrences share the index of its first occurrence
+        specification = Specification()\
+            .forall(q = changes('x').during('function'))\
+            .check(lambda q : all_are_true(q('x') < 3, one_is_true(q('x') < 3, q('y') < 3)))
+        constraint = specification.get_constraint()
+        atom_index = constraint.get_atomic_constraints().index(constraint.get_instantiated().get_conjuncts()[0])
+        # a single measurement resolves both occurrences
+        self.assertIs(FormulaTree([0], constraint, ['q']).update_with_measurement(1, atom_index, 0), True)
+        self.assertIs(FormulaTree([0], constraint, ['q']).update_with_measurement(5, atom_index, 0), False)
+    
+    def test_disjunction_all_false(self):
+        formula_tree = FormulaTree([0], self.disjunction_specification.get_constraint(), ['q'])
+        # the first false disjunct leaves the disjunction unresolved
+        result = formula_tree.update_with_measurement(5, 0, 0)
+        self.assertNotIn(result, [True, False])
+        # once every disjunct is false, so is the disjunction
+        result = formula_tree.update_with_measurement(5, 1, 0)
+        self.assertIs(result, False)
+        self.assertIs(formula_tree.get_configuration(), False)
+    
+    def test_disjunction_one_true(self):
+        formula_tree = FormulaTree([0], self.disjunction_specification.get_constraint(), ['q'])
+        self.assertIs(formula_tree.update_with_measurement(1, 0, 0), True)
+    
+    def test_conjunction_all_true(self):
+        formula_tree = FormulaTree([0], self.conjunction_specification.get_constraint(), ['q'])
+        result = formula_tree.update_with_measurement(1, 0, 0)
+        self.assertNotIn(result, [True, False])
+        self.assertIs(formula_tree.update_with_measurement(1, 1, 0), True)
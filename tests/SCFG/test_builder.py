@@ -15,6 +15,7 @@ import VyPR.Logging.logger as logger
 
 from VyPR.SCFG.builder import SCFG
 from VyPR.SCFG.search import SCFGSearcher
+from VyPR.SCFG.symbolic_states import ForLoopEntrySymbolicState
 from VyPR.Specifications.predicates import calls, changes
 from VyPR.Specifications.constraints import ConcreteStateVariable
 
@@ -55,4 +56,93 @@ class TestSCFGBuilder(unittest.TestCase):
         symbolic_states = self.scfg.get_next_symbolic_states('f1', self.root_symbolic_state)
         # assertions
         for symbolic_state in symbolic_states:
-            self.assertListEqual(symbolic_state.get_symbols_changed(), ['f1'])
\ No newline at end of file
+            self.assertListEqual(symbolic_state.get_symbols_changed(), ['f1'])
+
+
+class TestSCFGBuilderReachability(unittest.TestCase):
+
+    def setUp(self):
+        # initialise logger
+        logger.initialise_logging(directory="../logs/test-logs/")
+        # define code containing a conditional and a loop
+        self.code = "\n".join([
+            "a = f()",
+            "if a:",
+            "    b = g()",
+            "else:",
+            "    c = h()",
+            "for i in range(10):",
+            "    d = k()",
+            "e = m()"
+        ])
+        # build scfg
+        self.scfg = SCFG(ast.parse(self.code).body)
+        # map the symbols changed by each statement symbolic state to that symbolic state
+        self.statements = {
+            tuple(symbolic_state.get_symbols_changed()): symbolic_state
+            for symbolic_state in self.scfg.get_symbolic_states()
+            if symbolic_state.is_statement_symbolic_state()
+        }
+        # get the for-loop entry symbolic state
+        self.loop_entry = next(
+            symbolic_state for symbolic_state in self.scfg.get_symbolic_states()
+            if type(symbolic_state) is ForLoopEntrySymbolicState
+        )
+    
+    def tearDown(self):
+        # close logging
+        logger.end_logging()
+    
+    def _reachable_by_children(self, source_symbolic_state):
+        # determine the reachable symbolic states by following get_children directly
+        visited = [source_symbolic_state]
+        stack = [source_symbolic_state]
+        while stack:
+            for child in stack.pop().get_children():
+                if child not in visited:
+                    visited.append(child)
+                    stack.append(child)
+        return visited[1:]
+    
+    def test_reachable_from_branch(self):
+        # from inside one branch, the other branch and the statements before the conditional are not reachable
+        reachable = self.scfg._get_reachable_symbolic_states(self.statements[('b', 'g')])
+        reachable_statements = [symbolic_state for symbolic_state in reachable if symbolic_state.is_statement_symbolic_state()]
+        self.assertCountEqual(reachable_statements, [self.statements[('d', 'k')], self.statements[('e', 'm')]])
+        self.assertIn(self.loop_entry, reachable)
+        self.assertNotIn(self.statements[('c', 'h')], reachable)
+        self.assertNotIn(self.statements[('a', 'f')], reachable)
+    
+    def test_reachable_from_loop_body(self):
+        # from the loop body, the loop entry is reachable through the back edge
+        reachable = self.scfg._get_reachable_symbolic_states(self.statements[('d', 'k')])
+        self.assertIn(self.loop_entry, reachable)
+        self.assertIn(self.statements[('e', 'm')], reachable)
+        self.assertNotIn(self.statements[('b', 'g')], reachable)
+        self.assertTrue(self.scfg.is_reachable_from(self.statements[('e', 'm')], self.statements[('d', 'k')]))
+        self.assertFalse(self.scfg.is_reachable_from(self.statements[('a', 'f')], self.statements[('d', 'k')]))
+    
+    def test_reachable_from_state_in_other_scfg(self):
+        # a symbolic state from a different SCFG reaches nothing in this one
+        other_scfg = SCFG(ast.parse("x = f()").body)
+        other_symbolic_state = other_scfg.get_root_symbolic_state()
+        self.assertListEqual(self.scfg._get_reachable_symbolic_states(other_symbolic_state), [])
+        self.assertFalse(self.scfg.is_reachable_from(self.statements[('e', 'm')], other_symbolic_state))
+    
+    def test_reachable_matches_children(self):
+        # the traversal over the adjacency arrays must agree with following get_children
+        for symbolic_state in self.scfg.get_symbolic_states():
+            self.assertCountEqual(
+                self.scfg._get_reachable_symbolic_states(symbolic_state),
+                self._reachable_by_children(symbolic_state)
+            )
+    
+    def test_to_csr(self):
+        # the children given by the adjacency arrays are those of each symbolic state, in order
+        succ_offsets, succ_nodes, pred_offsets, pred_nodes = self.scfg.to_csr()
+        symbolic_states = self.scfg.get_symbolic_states()
+        for (index, symbolic_state) in enumerate(symbolic_states):
+            children = [symbolic_states[i] for i in succ_nodes[succ_offsets[index]:succ_offsets[index + 1]]]
+            parents = [symbolic_states[i] for i in pred_nodes[pred_offsets[index]:pred_offsets[index + 1]]]
+            self.assertListEqual(children, list(symbolic_state.get_children()))
+            self.assertListEqual(parents, list(symbolic_state.get_parents()))
@@ -32,6 +32,13 @@ class TestSpecificationsBuilderSingleQuantifier(unittest.TestCase):
     def test_get_variables(self):
         self.assertListEqual(self.specification.get_variables(), ['q'])
     
+    def test_get_variables_not_shared(self):
+        # modifying the results of one call must not affect later calls
+        self.specification.get_variables().append('t')
+        self.specification.get_variable_to_obj_map()['t'] = None
+        self.assertListEqual(self.specification.get_variables(), ['q'])
+        self.assertListEqual(list(self.specification.get_variable_to_obj_map().keys()), ['q'])
+    
     def test_get_function_names_used(self):
         function_names_used = self.specification.get_function_names_used()
         self.assertListEqual(function_names_used, ['function'])
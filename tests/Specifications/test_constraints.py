@@ -20,8 +20,11 @@ from VyPR.Specifications.constraints import (ConcreteStateVariable,
                                             get_base_variable,
                                             TimeBetweenLessThanConstant,
                                             DurationOfTransitionLessThanConstant,
+                                            DurationOfTransitionGreaterThanConstant,
+                                            ValueInConcreteStateGreaterThanConstant,
                                             ConcreteStateBeforeTransition)
 from VyPR.Specifications.predicates import changes, calls
+from VyPR.Monitoring.formula_trees import FormulaTree
 
 class TestSpecificationsBuilder(unittest.TestCase):
 
@@ -102,4 +105,30 @@ class TestSpecificationsBuilder(unittest.TestCase):
         atomic_constraints = self.specification.get_constraint().get_atomic_constraints()
         # assertions
         self.assertIsInstance(atomic_constraints[0], DurationOfTransitionLessThanConstant)
-        self.assertIsInstance(atomic_constraints[1], TimeBetweenLessThanConstant)
\ No newline at end of file
+        self.assertIsInstance(atomic_constraints[1], TimeBetweenLessThanConstant)
+    
+    def test_comparison_with_bool_constant(self):
+        # bool constants are only accepted for equality of values, as in the original type checks
+        self.assertIsNone(self.q('x') < True)
+        self.assertIsNone(self.q('x') > False)
+        self.assertIsNone(self.next_call.duration() < False)
+        self.assertIsNone(self.q('x').length() < True)
+        self.assertTrue(is_normal_atom(self.q('x').equals(True)))
+    
+    def test_duration_greater_than_constant(self):
+        atom = self.next_call.duration() > 1
+        self.assertIsInstance(atom, DurationOfTransitionGreaterThanConstant)
+        self.assertTrue(is_normal_atom(atom))
+        # check the atom against measurements on either side of the constant
+        self.assertIs(atom.check(0, 0, {0: {0: 2}}), True)
+        self.assertIs(atom.check(0, 0, {0: {0: 0.5}}), False)
+    
+    def test_value_greater_than_constant_in_formula_tree(self):
+        specification = Specification()\
+            .forall(q = changes('string').during('function'))\
+            .check(lambda q : q('string') > 3)
+        constraint = specification.get_constraint()
+        self.assertIsInstance(constraint.get_atomic_constraints()[0], ValueInConcreteStateGreaterThanConstant)
+        # evaluate the atom through a formula tree for measurements on either side of the constant
+        self.assertIs(FormulaTree([0], constraint, ['q']).update_with_measurement(5, 0, 0), True)
+        self.assertIs(FormulaTree([0], constraint, ['q']).update_with_measurement(1, 0, 0), False)
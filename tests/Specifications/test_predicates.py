@@ -36,6 +36,14 @@ class TestSpecificationsPredicates(unittest.TestCase):
         complete_calls_predicate = self.incomplete_calls_predicate.during('function')
         self.assertIsInstance(complete_calls_predicate, calls)
     
+    def test_hash_unchanged_by_during(self):
+        # during modifies the predicate, so its hash must not depend on the function given
+        predicate = changes('string')
+        predicate_set = {predicate}
+        self.assertIs(predicate.during('function'), predicate)
+        self.assertIn(predicate, predicate_set)
+        self.assertEqual(hash(predicate), hash(changes('string').during('function')))
+    
     def test_future_changes(self):
         self.assertIsInstance(self.predicate_future_changes.get_predicate(), changes)
     